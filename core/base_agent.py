@@ -333,10 +333,9 @@ class BaseAgent(ABC):
                 role="assistant", content=assistant_message, timestamp=now
             )
 
-            # Append to session
-            self.memory_backend.append_message(session_id, user_msg, self.agent_type)
-            self.memory_backend.append_message(
-                session_id, assistant_msg, self.agent_type
+            # Append both messages to the session in one call
+            self.memory_backend.append_messages(
+                session_id, [user_msg, assistant_msg], self.agent_type
             )
 
         except Exception as e:
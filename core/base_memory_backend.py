@@ -1,10 +1,15 @@
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+# Slotted dataclasses (3.10+) drop the per-instance __dict__; on older Pythons
+# the records fall back to regular dataclasses
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class ChatMessage:
     """Represents a chat message in a conversation."""
 
@@ -14,7 +19,7 @@ class ChatMessage:
     metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ConversationSession:
     """Represents a conversation session."""
 
@@ -133,6 +138,28 @@ class MemoryBackend(ABC):
         """
         pass
 
+    def append_messages(
+        self, session_id: str, messages: List[ChatMessage], agent_type: str
+    ) -> bool:
+        """
+        Append several messages to a session, in order.
+
+        The default appends them one at a time; backends that can store a
+        batch in a single write should override this.
+
+        Args:
+            session_id: Session to append to
+            messages: Messages to append
+            agent_type: Agent type for the session
+
+        Returns:
+            True if every message was appended, False otherwise
+        """
+        return all(
+            self.append_message(session_id, message, agent_type)
+            for message in messages
+        )
+
     @abstractmethod
     def get_recent_messages(
         self, session_id: str, limit: int = 10
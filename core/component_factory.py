@@ -1,5 +1,6 @@
 import importlib
 import logging
+from importlib.metadata import entry_points
 from typing import Any, Dict, List, Optional, Type
 
 from .base_config_provider import (
@@ -16,6 +17,17 @@ from .base_vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
+# Entry point group used to advertise vector store implementations
+VECTOR_STORE_ENTRY_POINT_GROUP = "ai_agent.vector_stores"
+
+
+def _vector_store_entry_points() -> list:
+    """Return the entry points advertised for vector store implementations."""
+    try:
+        return list(entry_points(group=VECTOR_STORE_ENTRY_POINT_GROUP))
+    except TypeError:  # Python < 3.10
+        return list(entry_points().get(VECTOR_STORE_ENTRY_POINT_GROUP, []))
+
 
 class ComponentFactory:
     """Factory for creating components based on configuration."""
@@ -29,6 +41,12 @@ class ComponentFactory:
     _embedding_provider_registry: Dict[str, Type[EmbeddingProvider]] = {}
     _tool_registry: Dict[str, Type[BaseTool]] = {}
 
+    # Built-in vector stores resolved on first use (mirrors the setup.py entry
+    # points so that directory-based checkouts behave like installed packages)
+    _lazy_vector_stores: Dict[str, str] = {
+        "chroma": "providers.chroma_vector_store:ChromaVectorStore",
+    }
+
     @classmethod
     def register_vector_store(
         cls, name: str, implementation: Type[VectorStore]
@@ -99,12 +117,41 @@ class ComponentFactory:
         """
         store_type = config.get("type", "chroma")  # Default to chroma
 
+        if store_type not in cls._vector_store_registry:
+            cls._load_vector_store(store_type)
+
         if store_type not in cls._vector_store_registry:
             raise ValueError(f"Unknown vector store type: {store_type}")
 
         implementation = cls._vector_store_registry[store_type]
         return implementation(config)
 
+    @classmethod
+    def _load_vector_store(cls, store_type: str) -> None:
+        """
+        Import and register a vector store that is not registered yet.
+
+        Implementations are looked up in the ``ai_agent.vector_stores`` entry
+        point group first and then in the built-in lazy table, so their
+        dependencies are only imported when that backend is actually requested.
+        """
+        matches = [ep for ep in _vector_store_entry_points() if ep.name == store_type]
+        try:
+            if matches:
+                implementation = matches[0].load()
+            elif store_type in cls._lazy_vector_stores:
+                module_name, _, attr = cls._lazy_vector_stores[store_type].partition(
+                    ":"
+                )
+                implementation = getattr(importlib.import_module(module_name), attr)
+            else:
+                return
+        except ImportError as e:
+            logger.warning(f"Failed to load vector store '{store_type}': {e}")
+            return
+
+        cls.register_vector_store(store_type, implementation)
+
     @classmethod
     def create_document_store(cls, config: Dict[str, Any]) -> DocumentStore:
         """
@@ -284,12 +331,15 @@ class ComponentFactory:
                         "embedding.type": "openai",
                         "embedding.model": "text-embedding-ada-002",
                     }
+                    # list_keys results by prefix, cleared whenever keys change
+                    self._list_cache: Dict[Optional[str], tuple] = {}
 
                 def get_config(self, key: str, default=None):
                     return self.defaults.get(key, default)
 
                 def set_config(self, key: str, value):
                     self.defaults[key] = value
+                    self._list_cache.clear()
                     return True
 
                 def has_config(self, key: str) -> bool:
@@ -304,9 +354,16 @@ class ComponentFactory:
                     return result
 
                 def list_keys(self, prefix=None) -> list:
-                    if prefix:
-                        return [k for k in self.defaults.keys() if k.startswith(prefix)]
-                    return list(self.defaults.keys())
+                    prefix = prefix or None
+                    cached = self._list_cache.get(prefix)
+                    if cached is None:
+                        cached = tuple(
+                            k
+                            for k in self.defaults
+                            if prefix is None or k.startswith(prefix)
+                        )
+                        self._list_cache[prefix] = cached
+                    return list(cached)
 
             return MinimalDefaultProvider()
 
@@ -318,7 +375,6 @@ class ComponentFactory:
         """
         try:
             # Import default implementations to trigger registration
-            import providers.chroma_vector_store  # noqa
             import providers.filesystem_document_store  # noqa
             import providers.in_memory_backend  # noqa
             import providers.openai_embedding_provider  # noqa
@@ -339,11 +395,20 @@ class ComponentFactory:
         """
         List all available implementations by category.
 
+        Vector stores include those that are loaded on first use, either
+        built in or advertised through entry points.
+
         Returns:
             Dictionary mapping component types to available implementations
         """
+        vector_stores = dict.fromkeys(cls._vector_store_registry)
+        vector_stores.update(dict.fromkeys(cls._lazy_vector_stores))
+        vector_stores.update(
+            dict.fromkeys(ep.name for ep in _vector_store_entry_points())
+        )
+
         return {
-            "vector_stores": list(cls._vector_store_registry.keys()),
+            "vector_stores": list(vector_stores),
             "document_stores": list(cls._document_store_registry.keys()),
             "memory_backends": list(cls._memory_backend_registry.keys()),
             "config_providers": list(cls._config_provider_registry.keys()),
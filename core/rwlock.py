@@ -0,0 +1,90 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class RWLock:
+    """
+    Reader-writer lock allowing concurrent readers and exclusive writers.
+
+    Both sides are reentrant: a thread holding the write lock may take it again
+    or take the read lock, and a reader may nest further reads. Waiting writers
+    block new readers so writers are not starved. Upgrading a held read lock to
+    a write lock is not supported and raises RuntimeError.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+
+    def acquire_read(self) -> None:
+        """Acquire the lock for shared (read) access."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me or me in self._readers:
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return
+
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers[me] = 1
+
+    def release_read(self) -> None:
+        """Release a shared (read) hold."""
+        me = threading.get_ident()
+        with self._cond:
+            count = self._readers[me] - 1
+            if count:
+                self._readers[me] = count
+            else:
+                del self._readers[me]
+                if not self._readers:
+                    self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        """Acquire the lock for exclusive (write) access."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """Release an exclusive (write) hold."""
+        with self._cond:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        """Context manager holding the read lock."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        """Context manager holding the write lock."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
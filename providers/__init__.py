@@ -1,6 +1,5 @@
 """Provider implementations for AI agent base."""
 
-from .chroma_vector_store import ChromaVectorStore
 from .filesystem_document_store import FileSystemDocumentStore
 from .in_memory_backend import InMemoryBackend
 from .yaml_config_provider import YAMLConfigProvider
@@ -11,3 +10,13 @@ __all__ = [
     "InMemoryBackend",
     "YAMLConfigProvider",
 ]
+
+
+def __getattr__(name):
+    # ChromaVectorStore is resolved on first access so importing the package
+    # does not pull in the Chroma backend unless it is used.
+    if name == "ChromaVectorStore":
+        from .chroma_vector_store import ChromaVectorStore
+
+        return ChromaVectorStore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -264,9 +264,3 @@ class ChromaVectorStore(VectorStore):
             }
         except Exception:
             return {"name": self.collection_name, "count": 0, "metadata": {}}
-
-
-# Register with factory
-from core.component_factory import ComponentFactory
-
-ComponentFactory.register_vector_store("chroma", ChromaVectorStore)
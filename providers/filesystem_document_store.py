@@ -1,12 +1,95 @@
+import copy
 import hashlib
+import heapq
 import json
+import mmap
 import os
+import re
 import threading
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from core.base_document_store import DocumentStore, StoredDocument
+from core.rwlock import RWLock
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# O_DIRECT is Linux-specific; elsewhere large content uses the buffered path
+_O_DIRECT = getattr(os, "O_DIRECT", 0)
+_DIRECT_IO_ALIGNMENT = 4096
+
+# Version 2 shards content/ and metadata/ into hash-prefix subdirectories
+_LAYOUT_VERSION = 2
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Marks a filter key absent from a document's metadata
+_MISSING = object()
+
+
+def _json_dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(
+        obj, default=str, sort_keys=sort_keys, indent=2 if indent else None
+    ).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _FileSystemDocument(StoredDocument):
+    """StoredDocument that parses its ISO-8601 timestamps on first access."""
+
+    @property
+    def created_at(self) -> datetime:
+        return self._timestamp("created_at")
+
+    @created_at.setter
+    def created_at(self, value: Union[datetime, str]) -> None:
+        self.__dict__["_created_at"] = value
+
+    @property
+    def updated_at(self) -> datetime:
+        return self._timestamp("updated_at")
+
+    @updated_at.setter
+    def updated_at(self, value: Union[datetime, str]) -> None:
+        self.__dict__["_updated_at"] = value
+
+    def _timestamp(self, name: str) -> datetime:
+        value = self.__dict__["_" + name]
+        if isinstance(value, str):
+            value = self.__dict__["_" + name] = datetime.fromisoformat(value)
+        return value
+
+    def copy(self) -> "_FileSystemDocument":
+        """Copy with its own metadata dict, so callers cannot mutate a cached one."""
+        clone = copy.copy(self)
+        clone.metadata = dict(self.metadata)
+        return clone
+
+    def isoformat(self, name: str) -> str:
+        """Return a timestamp field as ISO-8601 without a parse round trip."""
+        value = self.__dict__["_" + name]
+        return value if isinstance(value, str) else value.isoformat()
 
 
 class FileSystemDocumentStore(DocumentStore):
@@ -29,110 +112,719 @@ class FileSystemDocumentStore(DocumentStore):
         self.metadata_path.mkdir(exist_ok=True)
         self.content_path.mkdir(exist_ok=True)
 
-        self._lock = threading.RLock()
+        self._lock = RWLock()
+
+        # Per-document locks serialize file I/O on the same doc_id without
+        # blocking work on other documents: doc_id -> [lock, refcount]
+        self._doc_locks: Dict[str, List[Any]] = {}
+        self._doc_locks_guard = threading.Lock()
+
+        # LRU cache of recently retrieved documents. Retrieval runs under the
+        # shared read lock, so the cache has its own mutex
+        self._doc_cache: "OrderedDict[str, _FileSystemDocument]" = OrderedDict()
+        self._doc_cache_max = config.get("doc_cache_size", 1024)
+        self._doc_cache_lock = threading.Lock()
+
+        # Inverted index (token -> doc_ids) and lowercase UTF-8 text per
+        # document for search, built on first use
+        self._postings: Optional[Dict[str, Set[str]]] = None
+        self._doc_tokens: Dict[str, Set[str]] = {}
+        self._lower_text: Dict[str, Tuple[bytes, Tuple[bytes, ...]]] = {}
+        self._postings_lock = threading.Lock()
+
+        # Index mutations are appended to index.log; a timer periodically
+        # compacts the log into the index.json snapshot
+        self._index_dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_interval = config.get("index_flush_interval_ms", 50) / 1000
+        self._compact_min_bytes = config.get("index_compact_bytes", 1 << 16)
+
+        # fsync files before renaming them into place (durability over speed)
+        self._fsync = config.get("fsync", False)
+
+        # Content at least this large is written with O_DIRECT
+        self._direct_io_threshold = config.get("direct_io_threshold", 1 << 20)
+
+        # Pretty-print metadata files (debugging aid; off on the hot path)
+        self._pretty_json = config.get("pretty_json", False)
+
+        # Metadata fields with a secondary index for equality filters
+        self._indexed_fields = tuple(config.get("indexed_fields", ()))
 
         # Load or create index
         self.index_file = self.base_path / "index.json"
+        self.index_log_file = self.base_path / "index.log"
         self._load_index()
+        self._log_fp = open(self.index_log_file, "ab", buffering=0)
+
+        # Documents are sharded into two-hex-char subdirectories
+        self._shard_dirs: Set[Path] = set()
+        if self._layout_version < _LAYOUT_VERSION and self.index:
+            self._migrate_layout()
 
     def _load_index(self) -> None:
         """Load document index from disk."""
+        self._layout_version = _LAYOUT_VERSION
         try:
             if self.index_file.exists():
-                with open(self.index_file, "r", encoding="utf-8") as f:
-                    self.index = json.load(f)
+                with open(self.index_file, "rb") as f:
+                    snapshot = _json_loads(f.read())
+
+                # Legacy snapshots are the bare index in the flat file layout
+                if "layout_version" in snapshot:
+                    self._layout_version = snapshot["layout_version"]
+                    self.index = snapshot["documents"]
+                else:
+                    self._layout_version = 1
+                    self.index = snapshot
             else:
                 self.index = {}
         except Exception:
             self.index = {}
 
+        self._snapshot_bytes = self._file_size(self.index_file)
+        self._log_bytes = self._file_size(self.index_log_file)
+        self._replay_log()
+
+        # Secondary lookup so get_document_by_hash does not scan the index
+        self._hash_to_id: Dict[str, str] = {}
+        for doc_id, doc_info in self.index.items():
+            content_hash = doc_info.get("content_hash")
+            if content_hash:
+                self._hash_to_id.setdefault(content_hash, doc_id)
+
+        # Secondary indexes on configured metadata fields: value -> doc_ids
+        self._secondary: Dict[str, Dict[Any, Dict[str, None]]] = {
+            field: {} for field in self._indexed_fields
+        }
+        for doc_id, doc_info in self.index.items():
+            self._index_fields(doc_id, None, doc_info.get("metadata"))
+
+    def _replay_log(self) -> None:
+        """Apply index.log records on top of the loaded snapshot."""
+        if not self._log_bytes:
+            return
+
+        with open(self.index_log_file, "rb+") as f:
+            data = f.read()
+            # Drop a torn tail from an interrupted append, so the next record
+            # starts on a fresh line instead of extending the broken one
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+                self._log_bytes = end
+
+        for line in data[:end].splitlines():
+            try:
+                record = _json_loads(line)
+            except ValueError:
+                continue  # Unparseable record
+
+            if record.get("op") == "put":
+                self.index[record["doc_id"]] = record["entry"]
+            elif record.get("op") == "del":
+                self.index.pop(record["doc_id"], None)
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        """Return the size of a file, or 0 if it does not exist."""
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
     def _save_index(self) -> None:
-        """Save document index to disk."""
+        """Save document index snapshot to disk and truncate the log."""
         try:
-            with open(self.index_file, "w", encoding="utf-8") as f:
-                json.dump(self.index, f, indent=2, default=str)
+            snapshot = {"layout_version": self._layout_version, "documents": self.index}
+            self._write_file_atomic(
+                self.index_file,
+                json.dumps(snapshot, indent=2, default=str).encode("utf-8"),
+            )
+
+            # The snapshot stays human-readable; it is only written on compaction.
+            # Records in the log are idempotent, so a crash before the
+            # truncate only replays changes the snapshot already contains
+            self._log_fp.seek(0)
+            self._log_fp.truncate()
+            self._snapshot_bytes = self._file_size(self.index_file)
+            self._log_bytes = 0
         except Exception:
             pass  # Log error in production
 
-    def _generate_doc_id(self, content: str, metadata: Dict[str, Any]) -> str:
-        """Generate a unique document ID."""
+    def _append_log(
+        self, op: str, doc_id: str, entry: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Record an index mutation in the log (caller holds the lock)."""
+        self._append_log_records([(op, doc_id, entry)])
+
+    def _append_log_records(
+        self, records: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> None:
+        """Record (op, doc_id, entry) mutations with a single log write."""
+        if not records:
+            return
+
+        lines = []
+        for op, doc_id, entry in records:
+            record = {"op": op, "doc_id": doc_id}
+            if entry is not None:
+                record["entry"] = entry
+            lines.append(_json_dumps(record) + b"\n")
+
+        if self._log_fp.closed:
+            self._log_fp = open(self.index_log_file, "ab", buffering=0)
+
+        data = b"".join(lines)
+        self._log_fp.write(data)
+        if self._fsync:
+            os.fsync(self._log_fp.fileno())
+        self._log_bytes += len(data)
+        self._mark_index_dirty()
+
+    def _maybe_compact(self) -> None:
+        """Compact the log into the snapshot once it outgrows it."""
+        if self._log_bytes > 4 * max(self._snapshot_bytes, self._compact_min_bytes):
+            self._save_index()
+
+    def _mark_index_dirty(self) -> None:
+        """Schedule a coalesced compaction check (caller holds the lock)."""
+        self._index_dirty = True
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self._flush_interval, self.flush)
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Flush the index log, compacting it if it has grown too large."""
+        with self._lock.write_locked():
+            if self._flush_timer is not None:
+                if self._flush_timer is not threading.current_thread():
+                    self._flush_timer.cancel()
+                self._flush_timer = None
+
+            if self._index_dirty:
+                if not self._log_fp.closed:
+                    self._log_fp.flush()
+                self._maybe_compact()
+                self._index_dirty = False
+
+    def close(self) -> None:
+        """Compact pending index changes into the snapshot and close the log."""
+        with self._lock.write_locked():
+            self.flush()
+            if self._log_bytes:
+                self._save_index()
+            self._log_fp.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _generate_doc_id_from_hash(
+        self, content_hash: str, metadata: Dict[str, Any]
+    ) -> str:
+        """Generate a unique document ID from an already computed content hash."""
         # Use content hash + metadata hash for uniqueness
-        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
-        metadata_str = json.dumps(metadata, sort_keys=True)
-        metadata_hash = hashlib.sha256(metadata_str.encode("utf-8")).hexdigest()[:8]
+        metadata_bytes = _json_dumps(metadata, sort_keys=True)
+        metadata_hash = hashlib.sha256(metadata_bytes).hexdigest()[:8]
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"{timestamp}_{content_hash}_{metadata_hash}"
+        return f"{timestamp}_{content_hash[:16]}_{metadata_hash}"
 
     def _calculate_content_hash(self, content: str) -> str:
         """Calculate SHA-256 hash of content."""
         return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
+    def _build_index_entry(self, doc_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the in-memory index entry for a document's stored metadata."""
+        return {
+            "content_hash": doc_metadata["content_hash"],
+            "created_at": doc_metadata["created_at"],
+            "updated_at": doc_metadata["updated_at"],
+            "file_path": doc_metadata.get("file_path"),
+            "content_length": doc_metadata.get("content_length"),
+            # Copied so later edits to the caller's dict cannot change query
+            # results or desynchronize the field indexes
+            "metadata": copy.deepcopy(doc_metadata["metadata"]),
+        }
+
+    def _unlink_hash(self, doc_id: str, content_hash: Optional[str]) -> None:
+        """Drop doc_id from the hash lookup, promoting another holder if any."""
+        if not content_hash or self._hash_to_id.get(content_hash) != doc_id:
+            return
+
+        del self._hash_to_id[content_hash]
+        for other_id, doc_info in self.index.items():
+            if other_id != doc_id and doc_info.get("content_hash") == content_hash:
+                self._hash_to_id[content_hash] = other_id
+                break
+
+    @staticmethod
+    def _compile_filter(filters: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """Build a predicate requiring every filter key to be present and equal."""
+        items = tuple(filters.items())
+
+        def predicate(metadata: Dict[str, Any]) -> bool:
+            for key, value in items:
+                if metadata.get(key, _MISSING) != value:
+                    return False
+            return True
+
+        return predicate
+
+    def _index_fields(
+        self,
+        doc_id: str,
+        old_metadata: Optional[Dict[str, Any]],
+        new_metadata: Optional[Dict[str, Any]],
+    ) -> None:
+        """Move doc_id between secondary index values (caller holds the lock)."""
+        for field, values in self._secondary.items():
+            if old_metadata and field in old_metadata:
+                try:
+                    doc_ids = values.get(old_metadata[field])
+                except TypeError:
+                    doc_ids = None  # Unhashable values are never indexed
+                if doc_ids is not None:
+                    doc_ids.pop(doc_id, None)
+                    if not doc_ids:
+                        del values[old_metadata[field]]
+
+            if new_metadata and field in new_metadata:
+                try:
+                    values.setdefault(new_metadata[field], {})[doc_id] = None
+                except TypeError:
+                    pass
+
+    def _secondary_candidates(self, filters: Dict[str, Any]) -> Optional[List[str]]:
+        """Intersect secondary indexes for the filters, or None if none apply."""
+        postings = []
+        for key, value in filters.items():
+            values = self._secondary.get(key)
+            if values is None:
+                continue
+            try:
+                postings.append(values.get(value, {}))
+            except TypeError:
+                continue
+
+        if not postings:
+            return None
+
+        postings.sort(key=len)
+        smallest, rest = postings[0], postings[1:]
+        return [
+            doc_id
+            for doc_id in smallest
+            if all(doc_id in doc_ids for doc_ids in rest)
+        ]
+
+    def _filter_index(
+        self, filters: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (doc_id, index entry) pairs whose metadata matches filters."""
+        if not filters:
+            return iter(self.index.items())
+
+        predicate = self._compile_filter(filters)
+        doc_ids = self._secondary_candidates(filters)
+        if doc_ids is None:
+            entries = self.index.items()
+        else:
+            entries = ((doc_id, self.index[doc_id]) for doc_id in doc_ids)
+
+        return (
+            (doc_id, doc_info)
+            for doc_id, doc_info in entries
+            if predicate(doc_info.get("metadata", {}))
+        )
+
+    @staticmethod
+    def _search_text(
+        content: str, metadata: Dict[str, Any]
+    ) -> Tuple[bytes, Tuple[bytes, ...]]:
+        """Lowercase UTF-8 copies of content and metadata values for matching."""
+        return (
+            content.lower().encode("utf-8"),
+            tuple(str(value).lower().encode("utf-8") for value in metadata.values()),
+        )
+
+    @staticmethod
+    def _tokenize(content: str, metadata: Dict[str, Any]) -> Set[str]:
+        """Collect the lowercase word tokens of content and metadata values."""
+        tokens = set(_TOKEN_RE.findall(content.lower()))
+        for value in metadata.values():
+            tokens.update(_TOKEN_RE.findall(str(value).lower()))
+        return tokens
+
+    def _index_search_text(
+        self, doc_id: str, content: Optional[str], metadata: Dict[str, Any]
+    ) -> None:
+        """
+        Replace the search entries of doc_id (caller holds the write lock).
+
+        Passing content=None removes the document from the search index.
+        """
+        if self._postings is None:
+            return  # Built on the first search
+
+        for token in self._doc_tokens.pop(doc_id, ()):
+            posting = self._postings[token]
+            posting.discard(doc_id)
+            if not posting:
+                del self._postings[token]
+        self._lower_text.pop(doc_id, None)
+
+        if content is not None:
+            tokens = self._tokenize(content, metadata)
+            self._doc_tokens[doc_id] = tokens
+            for token in tokens:
+                self._postings.setdefault(token, set()).add(doc_id)
+            self._lower_text[doc_id] = self._search_text(content, metadata)
+
+    def _build_postings(self) -> None:
+        """Build the inverted index and lowercase text cache from disk."""
+        with self._postings_lock:
+            if self._postings is not None:
+                return
+
+            postings: Dict[str, Set[str]] = {}
+            doc_tokens: Dict[str, Set[str]] = {}
+            lower_text: Dict[str, Tuple[bytes, Tuple[bytes, ...]]] = {}
+            for doc_id in self.index:
+                doc = self.retrieve_document(doc_id)
+                if doc:
+                    tokens = self._tokenize(doc.content, doc.metadata)
+                    doc_tokens[doc_id] = tokens
+                    for token in tokens:
+                        postings.setdefault(token, set()).add(doc_id)
+                    lower_text[doc_id] = self._search_text(doc.content, doc.metadata)
+
+            self._doc_tokens = doc_tokens
+            self._lower_text = lower_text
+            self._postings = postings
+
+    def _search_candidates(self, query_lower: str) -> Optional[Set[str]]:
+        """
+        Narrow a substring search to documents that can contain the query.
+
+        Every word in the query must be a substring of some token of a
+        matching document, so only the vocabulary is scanned rather than the
+        document bodies. Returns None when the query has no word characters.
+        """
+        query_tokens = set(_TOKEN_RE.findall(query_lower))
+        if not query_tokens:
+            return None
+
+        candidates: Optional[Set[str]] = None
+        for query_token in query_tokens:
+            posting = self._postings.get(query_token, set()).copy()
+            for token, doc_ids in self._postings.items():
+                if query_token in token:
+                    posting |= doc_ids
+
+            candidates = posting if candidates is None else candidates & posting
+            if not candidates:
+                break
+
+        return candidates
+
+    @contextmanager
+    def _acquire_doc_lock(self, doc_id: str) -> Iterator[None]:
+        """
+        Hold the per-document lock for doc_id.
+
+        Locks are reference counted and dropped once no thread holds or waits
+        for them. Lock order is always document lock before the store lock.
+        """
+        with self._doc_locks_guard:
+            entry = self._doc_locks.get(doc_id)
+            if entry is None:
+                entry = self._doc_locks[doc_id] = [threading.RLock(), 0]
+            entry[1] += 1
+
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._doc_locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._doc_locks[doc_id]
+
+    def _write_file_atomic(self, path: Path, data: bytes) -> None:
+        """Write a file via a temporary sibling so readers never see partial data."""
+        tmp_file = path.with_name(path.name + ".tmp")
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            # A single write in practice; loop only on a short write
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            if self._fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, path)
+
+    def _write_content(self, path: Path, data: bytes) -> None:
+        """Write document content, bypassing the page cache for large bodies."""
+        if _O_DIRECT and len(data) >= self._direct_io_threshold:
+            try:
+                self._write_content_direct(path, data)
+                return
+            except OSError:
+                pass  # Filesystem without O_DIRECT support (e.g. tmpfs)
+        self._write_file_atomic(path, data)
+
+    def _write_content_direct(self, path: Path, data: bytes) -> None:
+        """Write content with O_DIRECT from a page-aligned buffer."""
+        aligned_len = -(-len(data) // _DIRECT_IO_ALIGNMENT) * _DIRECT_IO_ALIGNMENT
+        tmp_file = path.with_name(path.name + ".tmp")
+
+        # Anonymous mmaps are page aligned, as O_DIRECT requires
+        with mmap.mmap(-1, aligned_len) as buf:
+            buf.write(data)
+            fd = os.open(
+                tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_DIRECT, 0o644
+            )
+            try:
+                os.pwrite(fd, buf, 0)
+                os.ftruncate(fd, len(data))
+                if self._fsync:
+                    os.fsync(fd)
+            except OSError:
+                os.close(fd)
+                os.unlink(tmp_file)
+                raise
+            os.close(fd)
+        os.replace(tmp_file, path)
+
+    def _cache_get(self, doc_id: str) -> Optional[StoredDocument]:
+        """Return a copy of a cached document, refreshing its recency."""
+        with self._doc_cache_lock:
+            doc = self._doc_cache.get(doc_id)
+            if doc is None:
+                return None
+            self._doc_cache.move_to_end(doc_id)
+        return doc.copy()
+
+    def _cache_put(self, doc_id: str, doc: "_FileSystemDocument") -> None:
+        """Cache a freshly read document, evicting the least recently used."""
+        if self._doc_cache_max <= 0:
+            return
+        with self._doc_cache_lock:
+            self._doc_cache[doc_id] = doc
+            self._doc_cache.move_to_end(doc_id)
+            while len(self._doc_cache) > self._doc_cache_max:
+                self._doc_cache.popitem(last=False)
+
+    def _cache_invalidate(self, doc_id: str) -> None:
+        """Drop a document from the cache (caller holds the write lock)."""
+        with self._doc_cache_lock:
+            self._doc_cache.pop(doc_id, None)
+
+    @staticmethod
+    def _shard(doc_id: str) -> str:
+        """Subdirectory for a document: the first two hex chars of its hash."""
+        parts = doc_id.rsplit("_", 2)
+        if len(parts) == 3 and len(parts[1]) == 16:
+            return parts[1][:2]
+        return hashlib.sha256(doc_id.encode("utf-8")).hexdigest()[:2]
+
     def _get_content_file_path(self, doc_id: str) -> Path:
         """Get file path for document content."""
-        return self.content_path / f"{doc_id}.txt"
+        return self.content_path / self._shard(doc_id) / f"{doc_id}.txt"
 
     def _get_metadata_file_path(self, doc_id: str) -> Path:
         """Get file path for document metadata."""
-        return self.metadata_path / f"{doc_id}.json"
+        return self.metadata_path / self._shard(doc_id) / f"{doc_id}.json"
+
+    def _ensure_parent(self, path: Path) -> None:
+        """Create a shard directory on first use."""
+        parent = path.parent
+        if parent not in self._shard_dirs:
+            parent.mkdir(exist_ok=True)
+            self._shard_dirs.add(parent)
+
+    def _migrate_layout(self) -> None:
+        """Move documents from the legacy flat layout into shard directories."""
+        for doc_id in self.index:
+            for flat_dir, sharded in (
+                (self.content_path, self._get_content_file_path(doc_id)),
+                (self.metadata_path, self._get_metadata_file_path(doc_id)),
+            ):
+                flat = flat_dir / sharded.name
+                if flat.exists():
+                    self._ensure_parent(sharded)
+                    os.replace(flat, sharded)
+
+        self._layout_version = _LAYOUT_VERSION
+        self._save_index()
 
     def store_document(
-        self, content: str, metadata: Dict[str, Any], file_path: Optional[str] = None
+        self,
+        content: str,
+        metadata: Dict[str, Any],
+        file_path: Optional[str] = None,
+        content_hash: Optional[str] = None,
     ) -> str:
-        """Store a document with its metadata."""
-        with self._lock:
-            doc_id = self._generate_doc_id(content, metadata)
-            now = datetime.now()
-            content_hash = self._calculate_content_hash(content)
-
-            # Check if document with same content hash already exists
-            existing_doc = self.get_document_by_hash(content_hash)
-            if existing_doc:
-                return existing_doc.doc_id
+        """
+        Store a document with its metadata.
 
-            try:
-                # Store content
-                content_file = self._get_content_file_path(doc_id)
-                with open(content_file, "w", encoding="utf-8") as f:
-                    f.write(content)
+        Args:
+            content: Document content
+            metadata: Document metadata
+            file_path: Optional original file path
+            content_hash: Precomputed SHA-256 hex digest of content; when given
+                the content is not hashed again
 
-                # Store metadata
-                doc_metadata = {
-                    "doc_id": doc_id,
+        Returns:
+            Document ID assigned to the stored document
+        """
+        return self.store_documents(
+            [
+                {
+                    "content": content,
                     "metadata": metadata,
-                    "created_at": now.isoformat(),
-                    "updated_at": now.isoformat(),
-                    "content_hash": content_hash,
                     "file_path": file_path,
-                    "content_length": len(content),
+                    "content_hash": content_hash,
                 }
+            ]
+        )[0]
 
-                metadata_file = self._get_metadata_file_path(doc_id)
-                with open(metadata_file, "w", encoding="utf-8") as f:
-                    json.dump(doc_metadata, f, indent=2)
+    def store_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store several documents, committing them to the index in one batch.
 
-                # Update index
-                self.index[doc_id] = {
-                    "content_hash": content_hash,
-                    "created_at": now.isoformat(),
-                    "file_path": file_path,
-                    "metadata": metadata,
-                }
-                self._save_index()
+        Args:
+            documents: Dicts with 'content', 'metadata' and optional 'file_path'
+                and precomputed 'content_hash'
+
+        Returns:
+            Document IDs in input order (existing IDs for duplicate content)
+        """
+        doc_ids: List[Optional[str]] = [None] * len(documents)
+        pending: Dict[str, Tuple[int, str, Dict[str, Any]]] = {}
+        batch_hashes: Dict[str, str] = {}
+        duplicates: List[Tuple[int, str]] = []
 
-                return doc_id
+        hashes = [
+            doc.get("content_hash") or self._calculate_content_hash(doc["content"])
+            for doc in documents
+        ]
+
+        # Duplicates are resolved from the in-memory hash map without touching
+        # document files; the write-lock commit re-checks for racing stores
+        with self._lock.read_locked():
+            known_ids = [self._hash_to_id.get(content_hash) for content_hash in hashes]
+
+        for position, (doc, content_hash) in enumerate(zip(documents, hashes)):
+            # Check if document with same content hash already exists
+            if known_ids[position] is not None:
+                doc_ids[position] = known_ids[position]
+                continue
+            if content_hash in batch_hashes:
+                duplicates.append((position, content_hash))
+                continue
+
+            doc_id = self._generate_doc_id_from_hash(content_hash, doc["metadata"])
+            batch_hashes[content_hash] = doc_id
+            pending[doc_id] = (position, content_hash, doc)
+
+        if pending:
+            self._write_documents(pending, doc_ids)
+
+        # Repeated content within the batch resolves to its first occurrence
+        for position, content_hash in duplicates:
+            doc_ids[position] = doc_ids[pending[batch_hashes[content_hash]][0]]
+
+        return doc_ids
+
+    def _write_documents(
+        self,
+        pending: Dict[str, Tuple[int, str, Dict[str, Any]]],
+        doc_ids: List[Optional[str]],
+    ) -> None:
+        """Write new document files, then commit them under one lock hold."""
+        now = datetime.now().isoformat()
+        written: List[Tuple[str, Dict[str, Any]]] = []
+
+        with ExitStack() as stack:
+            # Sorted acquisition keeps concurrent batches deadlock-free
+            for doc_id in sorted(pending):
+                stack.enter_context(self._acquire_doc_lock(doc_id))
+
+            try:
+                for doc_id, (_, content_hash, doc) in pending.items():
+                    content = doc["content"]
+                    doc_metadata = {
+                        "doc_id": doc_id,
+                        "metadata": doc["metadata"],
+                        "created_at": now,
+                        "updated_at": now,
+                        "content_hash": content_hash,
+                        "file_path": doc.get("file_path"),
+                        "content_length": len(content),
+                    }
+                    written.append((doc_id, doc_metadata))
+
+                    content_file = self._get_content_file_path(doc_id)
+                    metadata_file = self._get_metadata_file_path(doc_id)
+                    self._ensure_parent(content_file)
+                    self._ensure_parent(metadata_file)
+
+                    self._write_content(content_file, content.encode("utf-8"))
+                    self._write_file_atomic(
+                        metadata_file,
+                        _json_dumps(doc_metadata, indent=self._pretty_json),
+                    )
 
             except Exception as e:
                 # Cleanup on failure
-                content_file = self._get_content_file_path(doc_id)
-                metadata_file = self._get_metadata_file_path(doc_id)
-                content_file.unlink(missing_ok=True)
-                metadata_file.unlink(missing_ok=True)
+                for doc_id, _ in written:
+                    self._remove_document_files(doc_id)
                 raise e
 
+            # Only the index update needs the store-wide lock
+            records = []
+            with self._lock.write_locked():
+                for doc_id, doc_metadata in written:
+                    position = pending[doc_id][0]
+                    content_hash = doc_metadata["content_hash"]
+
+                    # A concurrent store of the same content may have won the race
+                    existing_id = self._hash_to_id.get(content_hash)
+                    if existing_id is not None and existing_id != doc_id:
+                        self._remove_document_files(doc_id)
+                        doc_ids[position] = existing_id
+                        continue
+
+                    self.index[doc_id] = self._build_index_entry(doc_metadata)
+                    self._hash_to_id[content_hash] = doc_id
+                    self._index_fields(doc_id, None, doc_metadata["metadata"])
+                    self._index_search_text(
+                        doc_id, pending[doc_id][2]["content"], doc_metadata["metadata"]
+                    )
+                    records.append(("put", doc_id, self.index[doc_id]))
+                    doc_ids[position] = doc_id
+
+                self._append_log_records(records)
+
+    def _remove_document_files(self, doc_id: str) -> None:
+        """Remove the content and metadata files of a document."""
+        self._get_content_file_path(doc_id).unlink(missing_ok=True)
+        self._get_metadata_file_path(doc_id).unlink(missing_ok=True)
+
     def retrieve_document(self, doc_id: str) -> Optional[StoredDocument]:
         """Retrieve a document by its ID."""
-        with self._lock:
+        with self._lock.read_locked():
+            doc = self._cache_get(doc_id)
+            if doc is not None:
+                return doc
+
             try:
                 metadata_file = self._get_metadata_file_path(doc_id)
                 content_file = self._get_content_file_path(doc_id)
@@ -141,22 +833,24 @@ class FileSystemDocumentStore(DocumentStore):
                     return None
 
                 # Load metadata
-                with open(metadata_file, "r", encoding="utf-8") as f:
-                    doc_metadata = json.load(f)
+                with open(metadata_file, "rb") as f:
+                    doc_metadata = _json_loads(f.read())
 
                 # Load content
                 with open(content_file, "r", encoding="utf-8") as f:
                     content = f.read()
 
-                return StoredDocument(
+                doc = _FileSystemDocument(
                     doc_id=doc_metadata["doc_id"],
                     content=content,
                     metadata=doc_metadata["metadata"],
-                    created_at=datetime.fromisoformat(doc_metadata["created_at"]),
-                    updated_at=datetime.fromisoformat(doc_metadata["updated_at"]),
+                    created_at=doc_metadata["created_at"],
+                    updated_at=doc_metadata["updated_at"],
                     content_hash=doc_metadata["content_hash"],
                     file_path=doc_metadata.get("file_path"),
                 )
+                self._cache_put(doc_id, doc)
+                return doc.copy()
 
             except Exception:
                 return None
@@ -168,18 +862,19 @@ class FileSystemDocumentStore(DocumentStore):
         metadata: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Update an existing document."""
-        with self._lock:
+        with self._acquire_doc_lock(doc_id):
             try:
                 # Get existing document
                 existing_doc = self.retrieve_document(doc_id)
                 if not existing_doc:
                     return False
 
-                # Update content if provided
-                if content is not None:
+                old_hash = existing_doc.content_hash
+
+                # Update content if provided (unchanged content is not rehashed)
+                if content is not None and content != existing_doc.content:
                     content_file = self._get_content_file_path(doc_id)
-                    with open(content_file, "w", encoding="utf-8") as f:
-                        f.write(content)
+                    self._write_content(content_file, content.encode("utf-8"))
                     existing_doc.content = content
                     existing_doc.content_hash = self._calculate_content_hash(content)
 
@@ -188,31 +883,40 @@ class FileSystemDocumentStore(DocumentStore):
                     existing_doc.metadata.update(metadata)
 
                 # Update timestamp
-                existing_doc.updated_at = datetime.now()
+                updated_at = datetime.now().isoformat()
+                existing_doc.updated_at = updated_at
 
                 # Save updated metadata
                 doc_metadata = {
                     "doc_id": existing_doc.doc_id,
                     "metadata": existing_doc.metadata,
-                    "created_at": existing_doc.created_at.isoformat(),
-                    "updated_at": existing_doc.updated_at.isoformat(),
+                    "created_at": existing_doc.isoformat("created_at"),
+                    "updated_at": updated_at,
                     "content_hash": existing_doc.content_hash,
                     "file_path": existing_doc.file_path,
                     "content_length": len(existing_doc.content),
                 }
 
                 metadata_file = self._get_metadata_file_path(doc_id)
-                with open(metadata_file, "w", encoding="utf-8") as f:
-                    json.dump(doc_metadata, f, indent=2)
+                self._write_file_atomic(
+                    metadata_file, _json_dumps(doc_metadata, indent=self._pretty_json)
+                )
 
                 # Update index
-                self.index[doc_id] = {
-                    "content_hash": existing_doc.content_hash,
-                    "created_at": existing_doc.created_at.isoformat(),
-                    "file_path": existing_doc.file_path,
-                    "metadata": existing_doc.metadata,
-                }
-                self._save_index()
+                with self._lock.write_locked():
+                    old_entry = self.index.get(doc_id, {})
+                    self.index[doc_id] = self._build_index_entry(doc_metadata)
+                    self._index_fields(
+                        doc_id, old_entry.get("metadata"), existing_doc.metadata
+                    )
+                    if existing_doc.content_hash != old_hash:
+                        self._unlink_hash(doc_id, old_hash)
+                        self._hash_to_id.setdefault(existing_doc.content_hash, doc_id)
+                    self._cache_invalidate(doc_id)
+                    self._index_search_text(
+                        doc_id, existing_doc.content, existing_doc.metadata
+                    )
+                    self._append_log("put", doc_id, self.index[doc_id])
 
                 return True
 
@@ -221,18 +925,39 @@ class FileSystemDocumentStore(DocumentStore):
 
     def delete_document(self, doc_id: str) -> bool:
         """Delete a document by its ID."""
-        with self._lock:
-            try:
-                content_file = self._get_content_file_path(doc_id)
-                metadata_file = self._get_metadata_file_path(doc_id)
+        return self.delete_documents([doc_id])
+
+    def delete_documents(self, doc_ids: List[str]) -> bool:
+        """
+        Delete several documents, committing the removals in one batch.
+
+        Args:
+            doc_ids: Document IDs to delete
 
+        Returns:
+            True if successful, False otherwise
+        """
+        with ExitStack() as stack:
+            for doc_id in sorted(set(doc_ids)):
+                stack.enter_context(self._acquire_doc_lock(doc_id))
+
+            try:
                 # Remove files
-                content_file.unlink(missing_ok=True)
-                metadata_file.unlink(missing_ok=True)
+                for doc_id in doc_ids:
+                    self._remove_document_files(doc_id)
 
                 # Remove from index
-                self.index.pop(doc_id, None)
-                self._save_index()
+                records = []
+                with self._lock.write_locked():
+                    for doc_id in doc_ids:
+                        self._cache_invalidate(doc_id)
+                        doc_info = self.index.pop(doc_id, None)
+                        if doc_info is not None:
+                            self._unlink_hash(doc_id, doc_info.get("content_hash"))
+                            self._index_fields(doc_id, doc_info.get("metadata"), None)
+                            self._index_search_text(doc_id, None, {})
+                            records.append(("del", doc_id, None))
+                    self._append_log_records(records)
 
                 return True
 
@@ -247,39 +972,36 @@ class FileSystemDocumentStore(DocumentStore):
         order_by: Optional[str] = None,
     ) -> List[StoredDocument]:
         """List documents with optional filtering, pagination, and ordering."""
-        with self._lock:
-            documents = []
+        with self._lock.read_locked():
+            candidates = self._filter_index(filters)
+            order_field = order_by.lstrip("-") if order_by else None
 
-            for doc_id in self.index.keys():
-                doc = self.retrieve_document(doc_id)
-                if doc:
-                    # Apply filters
-                    if filters:
-                        match = True
-                        for key, value in filters.items():
-                            if key in doc.metadata and doc.metadata[key] != value:
-                                match = False
-                                break
-                        if not match:
-                            continue
+            start = offset or 0
+            stop = start + limit if limit else None
 
-                    documents.append(doc)
+            # Apply ordering (ISO-8601 timestamps sort lexicographically)
+            if order_field in ("created_at", "updated_at"):
+
+                def sort_key(item):
+                    return item[1].get(order_field) or item[1].get("created_at", "")
 
-            # Apply ordering
-            if order_by:
-                reverse = order_by.startswith("-")
-                order_field = order_by.lstrip("-")
+                descending = order_by.startswith("-")
+                if stop is not None:
+                    # A bounded page only needs its top `stop` entries
+                    pick = heapq.nlargest if descending else heapq.nsmallest
+                    candidates = pick(stop, candidates, key=sort_key)
+                else:
+                    candidates = sorted(candidates, key=sort_key, reverse=descending)
 
-                if order_field == "created_at":
-                    documents.sort(key=lambda d: d.created_at, reverse=reverse)
-                elif order_field == "updated_at":
-                    documents.sort(key=lambda d: d.updated_at, reverse=reverse)
+            # Apply pagination; unordered listings stop scanning at the page end
+            candidates = islice(candidates, start, stop)
 
-            # Apply pagination
-            if offset:
-                documents = documents[offset:]
-            if limit:
-                documents = documents[:limit]
+            # Only the final page is read from disk
+            documents = []
+            for doc_id, _ in candidates:
+                doc = self.retrieve_document(doc_id)
+                if doc:
+                    documents.append(doc)
 
             return documents
 
@@ -290,62 +1012,50 @@ class FileSystemDocumentStore(DocumentStore):
         limit: Optional[int] = None,
     ) -> List[StoredDocument]:
         """Search documents by content or metadata."""
-        with self._lock:
+        with self._lock.read_locked():
             results = []
             query_lower = query.lower()
+            query_bytes = query_lower.encode("utf-8")
+            self._build_postings()
+            candidates = self._search_candidates(query_lower)
 
-            for doc_id in self.index.keys():
-                doc = self.retrieve_document(doc_id)
-                if doc:
-                    # Apply filters first
-                    if filters:
-                        match = True
-                        for key, value in filters.items():
-                            if key in doc.metadata and doc.metadata[key] != value:
-                                match = False
-                                break
-                        if not match:
-                            continue
-
-                    # Search in content and metadata
-                    if query_lower in doc.content.lower() or any(
-                        query_lower in str(v).lower() for v in doc.metadata.values()
-                    ):
-                        results.append(doc)
+            # Filters are applied on the index so only candidates are checked,
+            # and only matching documents are read from disk
+            for doc_id, _ in self._filter_index(filters):
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                lower_text = self._lower_text.get(doc_id)
+                if lower_text is None:
+                    continue
 
-            # Apply limit
-            if limit:
-                results = results[:limit]
+                # Search in content and metadata
+                content_lower, metadata_lower = lower_text
+                if query_bytes in content_lower or any(
+                    query_bytes in value for value in metadata_lower
+                ):
+                    doc = self.retrieve_document(doc_id)
+                    if doc:
+                        results.append(doc)
+                        if limit and len(results) >= limit:
+                            break
 
             return results
 
     def get_document_by_hash(self, content_hash: str) -> Optional[StoredDocument]:
         """Retrieve a document by its content hash."""
-        with self._lock:
-            for doc_id, doc_info in self.index.items():
-                if doc_info.get("content_hash") == content_hash:
-                    return self.retrieve_document(doc_id)
-            return None
+        with self._lock.read_locked():
+            doc_id = self._hash_to_id.get(content_hash)
+            if doc_id is None:
+                return None
+            return self.retrieve_document(doc_id)
 
     def count_documents(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count documents matching the given filters."""
-        with self._lock:
+        with self._lock.read_locked():
             if not filters:
                 return len(self.index)
 
-            count = 0
-            for doc_id in self.index.keys():
-                doc = self.retrieve_document(doc_id)
-                if doc:
-                    match = True
-                    for key, value in filters.items():
-                        if key in doc.metadata and doc.metadata[key] != value:
-                            match = False
-                            break
-                    if match:
-                        count += 1
-
-            return count
+            return sum(1 for _ in self._filter_index(filters))
 
 
 # Register with factory
@@ -1,8 +1,45 @@
-import threading
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import heapq
+import json
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Set
 
 from core.base_memory_backend import ChatMessage, ConversationSession, MemoryBackend
+from core.rwlock import RWLock
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> str:
+    """Encode values JSON has no type for, matching orjson for dates."""
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize to JSON bytes, using orjson when it is installed.
+
+    Both paths accept the same input: dates and other non-JSON values are
+    encoded as strings and non-string keys are coerced like json does.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits, which json can encode
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class InMemoryBackend(MemoryBackend):
@@ -17,12 +54,24 @@ class InMemoryBackend(MemoryBackend):
         """
         self.config = config
         self.sessions: Dict[str, List[ChatMessage]] = {}
-        self.session_info: Dict[str, ConversationSession] = {}
-        self._lock = threading.RLock()  # Thread-safe operations
+        # Ordered least to most recently active; touched sessions move to the end
+        self.session_info: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        # Shared scans, exclusive writes; single-session lookups take no lock
+        self._lock = RWLock()
+
+        # Running message total so get_stats does not scan every session
+        self._total_messages = 0
+
+        # Session ids by user and by agent type for filtered listings
+        self._by_user: Dict[str, Set[str]] = {}
+        self._by_agent: Dict[str, Set[str]] = {}
 
         # Configuration
         self.max_sessions = config.get("max_sessions", 1000)
         self.default_session_timeout_hours = config.get("session_timeout_hours", 24)
+        # Optional cap on stored messages per session; the oldest are dropped
+        self.max_messages_per_session = config.get("max_messages_per_session")
+        self._verify_stats = config.get("verify_stats", False)  # Debug drift check
 
     def save_session(
         self,
@@ -32,24 +81,38 @@ class InMemoryBackend(MemoryBackend):
         user_id: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> bool:
-        """Save or update a conversation session."""
+        """
+        Save or update a conversation session.
+
+        A messages list is stored by reference rather than copied, so
+        ownership passes to the backend and callers should not mutate it
+        afterwards. Other sequences are copied into a new list.
+        """
         try:
             # Validate inputs
             if not session_id or not agent_type:
                 return False
-            with self._lock:
+            with self._lock.write_locked():
                 now = datetime.now()
 
-                # Update messages
-                self.sessions[session_id] = messages.copy()
+                # Update messages, keeping only the newest when capped. Other
+                # sequences (e.g. tuples) are copied so later appends work
+                cap = self.max_messages_per_session
+                if cap and len(messages) > cap:
+                    messages = list(messages[-cap:])
+                elif not isinstance(messages, list):
+                    messages = list(messages)
+                self.sessions[session_id] = messages
 
                 # Update or create session info
                 if session_id in self.session_info:
                     session_info = self.session_info[session_id]
                     session_info.last_active = now
+                    self._total_messages += len(messages) - session_info.message_count
                     session_info.message_count = len(messages)
                     if metadata:
                         session_info.metadata = metadata
+                    self.session_info.move_to_end(session_id)
                 else:
                     session_info = ConversationSession(
                         session_id=session_id,
@@ -61,6 +124,10 @@ class InMemoryBackend(MemoryBackend):
                         metadata=metadata,
                     )
                     self.session_info[session_id] = session_info
+                    self._total_messages += len(messages)
+                    if user_id:
+                        self._by_user.setdefault(user_id, set()).add(session_id)
+                    self._by_agent.setdefault(agent_type, set()).add(session_id)
 
                 # Cleanup old sessions if we exceed max
                 self._cleanup_excess_sessions()
@@ -71,21 +138,19 @@ class InMemoryBackend(MemoryBackend):
 
     def load_session(self, session_id: str) -> Optional[List[ChatMessage]]:
         """Load messages from a conversation session."""
-        with self._lock:
-            return self.sessions.get(session_id)
+        # Single-key dict reads are atomic under the GIL; no lock needed
+        return self.sessions.get(session_id)
 
     def get_session_info(self, session_id: str) -> Optional[ConversationSession]:
         """Get session metadata without loading all messages."""
-        with self._lock:
-            return self.session_info.get(session_id)
+        return self.session_info.get(session_id)
 
     def delete_session(self, session_id: str) -> bool:
         """Delete a conversation session."""
         try:
-            with self._lock:
+            with self._lock.write_locked():
                 # Remove from both dictionaries
-                self.sessions.pop(session_id, None)
-                self.session_info.pop(session_id, None)
+                self._drop_session(session_id, self.session_info.pop(session_id, None))
                 return True
         except Exception:
             return False
@@ -98,40 +163,67 @@ class InMemoryBackend(MemoryBackend):
         offset: Optional[int] = None,
     ) -> List[ConversationSession]:
         """List conversation sessions with optional filtering."""
-        with self._lock:
-            sessions = list(self.session_info.values())
-
-            # Apply filters
-            if user_id:
-                sessions = [s for s in sessions if s.user_id == user_id]
-            if agent_type:
-                sessions = [s for s in sessions if s.agent_type == agent_type]
-
-            # Sort by last_active (most recent first)
+        # Hold the lock only for the snapshot; sorting runs outside it so a
+        # large listing does not stall writers
+        with self._lock.read_locked():
+            session_ids = self._matching_ids(user_id, agent_type)
+            if session_ids is None:
+                sessions = list(self.session_info.values())
+            else:
+                sessions = [self.session_info[sid] for sid in session_ids]
+
+        # Sort by last_active (most recent first); a bounded page only
+        # needs the top offset + limit sessions
+        if limit:
+            sessions = heapq.nlargest(
+                (offset or 0) + limit, sessions, key=lambda s: s.last_active
+            )
+        else:
             sessions.sort(key=lambda s: s.last_active, reverse=True)
 
-            # Apply pagination
-            if offset:
-                sessions = sessions[offset:]
-            if limit:
-                sessions = sessions[:limit]
+        # Apply pagination
+        if offset:
+            sessions = sessions[offset:]
+        if limit:
+            sessions = sessions[:limit]
 
-            return sessions
+        return sessions
 
     def append_message(
         self, session_id: str, message: ChatMessage, agent_type: str
     ) -> bool:
         """Append a single message to an existing session."""
+        return self.append_messages(session_id, [message], agent_type)
+
+    def append_messages(
+        self, session_id: str, messages: List[ChatMessage], agent_type: str
+    ) -> bool:
+        """Append several messages to a session under one write lock."""
         try:
-            with self._lock:
-                # Get existing messages or create new list
-                messages = self.sessions.get(session_id, [])
-                messages.append(message)
-
-                # Save updated session
-                return self.save_session(
-                    session_id=session_id, messages=messages, agent_type=agent_type
-                )
+            if not session_id or not agent_type:
+                return False
+            with self._lock.write_locked():
+                stored = self.sessions.get(session_id)
+                if stored is None:
+                    return self.save_session(
+                        session_id=session_id,
+                        messages=list(messages),
+                        agent_type=agent_type,
+                    )
+
+                # Extend in place; only the session info needs refreshing.
+                # Extending and trimming are single list operations, so
+                # unlocked readers slicing the list never see them half done
+                stored.extend(messages)
+                cap = self.max_messages_per_session
+                if cap and len(stored) > cap:
+                    del stored[: len(stored) - cap]
+                session_info = self.session_info[session_id]
+                session_info.last_active = datetime.now()
+                self._total_messages += len(stored) - session_info.message_count
+                session_info.message_count = len(stored)
+                self.session_info.move_to_end(session_id)
+                return True
         except Exception:
             return False
 
@@ -139,63 +231,169 @@ class InMemoryBackend(MemoryBackend):
         self, session_id: str, limit: int = 10
     ) -> List[ChatMessage]:
         """Get the most recent messages from a session."""
-        with self._lock:
-            messages = self.sessions.get(session_id, [])
-            return messages[-limit:] if messages else []
+        # Slicing is a single atomic operation, so appends cannot tear it
+        messages = self.sessions.get(session_id)
+        return messages[-limit:] if messages else []
 
     def count_sessions(
         self, user_id: Optional[str] = None, agent_type: Optional[str] = None
     ) -> int:
         """Count sessions matching the given criteria."""
-        with self._lock:
-            sessions = list(self.session_info.values())
+        if not user_id and not agent_type:
+            return len(self.session_info)
+
+        with self._lock.read_locked():
+            return len(self._matching_ids(user_id, agent_type))
 
-            if user_id:
-                sessions = [s for s in sessions if s.user_id == user_id]
-            if agent_type:
-                sessions = [s for s in sessions if s.agent_type == agent_type]
+    def _matching_ids(
+        self, user_id: Optional[str], agent_type: Optional[str]
+    ) -> Optional[Set[str]]:
+        """Ids of sessions matching the filters, or None when unfiltered.
 
-            return len(sessions)
+        Must be called with the lock held; the returned set is a fresh copy.
+        """
+        if not user_id and not agent_type:
+            return None
+
+        indexes = []
+        if user_id:
+            indexes.append(self._by_user.get(user_id, set()))
+        if agent_type:
+            indexes.append(self._by_agent.get(agent_type, set()))
+        # Intersect from the smallest index so the work tracks the result size
+        indexes.sort(key=len)
+        return indexes[0].intersection(*indexes[1:])
 
     def cleanup_expired_sessions(self, max_age_hours: int = 24) -> int:
         """Remove sessions older than the specified age."""
         try:
-            with self._lock:
+            with self._lock.write_locked():
                 cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
-                expired_sessions = []
-
-                for session_id, session_info in self.session_info.items():
-                    if session_info.last_active < cutoff_time:
-                        expired_sessions.append(session_id)
-
-                # Remove expired sessions
-                for session_id in expired_sessions:
-                    self.sessions.pop(session_id, None)
-                    self.session_info.pop(session_id, None)
-
-                return len(expired_sessions)
+                expired_count = 0
+
+                # last_active is public and may be set directly, so insertion
+                # order is no guide to age; check every session
+                expired = [
+                    session_id
+                    for session_id, session_info in self.session_info.items()
+                    if session_info.last_active < cutoff_time
+                ]
+                for session_id in expired:
+                    self._drop_session(session_id, self.session_info.pop(session_id))
+                    expired_count += 1
+
+                return expired_count
         except Exception:
             return 0
 
     def _cleanup_excess_sessions(self) -> None:
         """Remove oldest sessions if we exceed max_sessions limit."""
-        if len(self.session_info) <= self.max_sessions:
-            return
+        # Least recently active sessions are at the front
+        while len(self.session_info) > self.max_sessions:
+            self._drop_session(*self.session_info.popitem(last=False))
+
+    def _drop_session(
+        self, session_id: str, session_info: Optional[ConversationSession]
+    ) -> None:
+        """Remove messages and index entries of a session whose info was popped."""
+        self.sessions.pop(session_id, None)
+        if session_info is not None:
+            self._total_messages -= session_info.message_count
+            for index, key in (
+                (self._by_user, session_info.user_id),
+                (self._by_agent, session_info.agent_type),
+            ):
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(session_id)
+                    if not ids:
+                        del index[key]
+
+    def export_session(self, session_id: str) -> Optional[bytes]:
+        """
+        Serialize a session and its messages to JSON bytes.
+
+        Args:
+            session_id: Session to export
+
+        Returns:
+            Bytes accepted by import_session, or None if the session is unknown
+        """
+        with self._lock.read_locked():
+            session_info = self.session_info.get(session_id)
+            if session_info is None:
+                return None
+            messages = list(self.sessions.get(session_id, ()))
+
+        return _dumps(
+            {
+                "session": {
+                    "session_id": session_info.session_id,
+                    "agent_type": session_info.agent_type,
+                    "created_at": session_info.created_at.isoformat(),
+                    "total_tokens": session_info.total_tokens,
+                    "user_id": session_info.user_id,
+                    "metadata": session_info.metadata,
+                },
+                "messages": [
+                    [m.role, m.content, m.timestamp.isoformat(), m.metadata]
+                    for m in messages
+                ],
+            }
+        )
+
+    def import_session(self, data: bytes) -> bool:
+        """
+        Restore a session produced by export_session.
 
-        # Get sessions sorted by last_active (oldest first)
-        sessions = sorted(self.session_info.items(), key=lambda x: x[1].last_active)
+        The restored session keeps its creation time but counts as active
+        now, like any other save.
 
-        # Remove oldest sessions
-        excess_count = len(self.session_info) - self.max_sessions
-        for i in range(excess_count):
-            session_id = sessions[i][0]
-            self.sessions.pop(session_id, None)
-            self.session_info.pop(session_id, None)
+        Args:
+            data: Bytes from export_session
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            payload = _loads(data)
+            info = payload["session"]
+            messages = [
+                ChatMessage(
+                    role=role,
+                    content=content,
+                    timestamp=datetime.fromisoformat(timestamp),
+                    metadata=metadata,
+                )
+                for role, content, timestamp, metadata in payload["messages"]
+            ]
+            session_id = info["session_id"]
+            with self._lock.write_locked():
+                if not self.save_session(
+                    session_id,
+                    messages,
+                    info["agent_type"],
+                    user_id=info["user_id"],
+                    metadata=info["metadata"],
+                ):
+                    return False
+                session_info = self.session_info.get(session_id)
+                if session_info is not None:
+                    session_info.created_at = datetime.fromisoformat(
+                        info["created_at"]
+                    )
+                    session_info.total_tokens = info["total_tokens"]
+                return True
+        except Exception:
+            return False
 
     def get_stats(self) -> Dict[str, Any]:
         """Get backend statistics."""
-        with self._lock:
-            total_messages = sum(len(messages) for messages in self.sessions.values())
+        with self._lock.read_locked():
+            total_messages = self._total_messages
+            if self._verify_stats:
+                actual = sum(len(messages) for messages in self.sessions.values())
+                assert total_messages == actual, "message counter drifted"
 
             return {
                 "total_sessions": len(self.session_info),
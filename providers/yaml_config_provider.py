@@ -1,23 +1,276 @@
+import copy
+import hashlib
 import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import yaml
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.base_config_provider import ConfigProvider
 
+# PyYAML is imported on first use by _import_yaml, so importing this module
+# (and registering the provider) does not pay for it
+yaml: Any = None
+_SafeLoader: Any = None
+_SafeDumper: Any = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Marks a key that is absent from the configuration
+_MISSING = object()
+
+# Parsed files keyed by (path, mtime_ns, size), so unchanged files are not
+# re-parsed on reload
+_PARSE_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_PARSE_CACHE_SIZE = 64
+_parse_cache_lock = threading.Lock()
+
+# Directory for msgpack snapshots of parsed YAML files. Snapshots are only
+# written when this environment variable is set, never next to the configs
+SIDECAR_DIR_ENV = "AI_AGENT_CONFIG_CACHE_DIR"
+
+# Upper bound on threads used to read and parse several cold files at once
+_MAX_PARSE_WORKERS = 4
+
+
+def _import_yaml() -> Any:
+    """Import PyYAML and pick its loader/dumper on first call."""
+    global yaml, _SafeLoader, _SafeDumper
+    if yaml is None:
+        import yaml as yaml_module
+
+        # Prefer the libyaml-backed loader/dumper when PyYAML was built with it
+        _SafeLoader = getattr(yaml_module, "CSafeLoader", yaml_module.SafeLoader)
+        _SafeDumper = getattr(yaml_module, "CSafeDumper", yaml_module.SafeDumper)
+        yaml = yaml_module
+    return yaml
+
+
+@lru_cache(maxsize=4096)
+def _split_key(key_path: str) -> Tuple[str, ...]:
+    """Split a dotted key path, caching the parts for repeated keys."""
+    return tuple(key_path.split("."))
+
+
+# Strings up to this length are interned so repeated values share one object
+_INTERN_MAX_LEN = 64
+
+
+def _intern_strings(data: Any) -> Any:
+    """Intern short string keys and values of parsed YAML, in place."""
+    stack = [data]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            items = list(current.items())
+            current.clear()
+            for key, value in items:
+                if isinstance(key, str) and len(key) <= _INTERN_MAX_LEN:
+                    key = sys.intern(key)
+                if isinstance(value, str) and len(value) <= _INTERN_MAX_LEN:
+                    value = sys.intern(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+                current[key] = value
+        else:
+            for i, value in enumerate(current):
+                if isinstance(value, str) and len(value) <= _INTERN_MAX_LEN:
+                    current[i] = sys.intern(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+    return data
+
+
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    """Stat a path, returning None if it does not exist or is unreadable."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _sidecar_path(path: str) -> Optional[str]:
+    """Path of the msgpack snapshot of a YAML file, or None if disabled."""
+    cache_dir = os.environ.get(SIDECAR_DIR_ENV)
+    if msgpack is None or not cache_dir:
+        return None
+    name = hashlib.blake2b(
+        os.path.abspath(path).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return os.path.join(cache_dir, name + ".msgpack")
+
+
+def _read_sidecar(path: str, st: os.stat_result) -> Optional[Dict[str, Any]]:
+    """Load the msgpack snapshot of a YAML file if it matches the file's stat."""
+    sidecar = _sidecar_path(path)
+    if sidecar is None:
+        return None
+    try:
+        with open(sidecar, "rb") as f:
+            snapshot = msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
+        if (
+            snapshot["mtime_ns"] == st.st_mtime_ns
+            and snapshot["size"] == st.st_size
+            and isinstance(snapshot["data"], dict)
+        ):
+            return snapshot["data"]
+    except Exception:
+        pass
+    return None
+
+
+def _write_sidecar(path: str, st: os.stat_result, data: Dict[str, Any]) -> None:
+    """Best-effort write of a msgpack snapshot of parsed YAML data."""
+    sidecar = _sidecar_path(path)
+    if sidecar is None:
+        return
+    try:
+        packed = msgpack.packb(
+            {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data},
+            use_bin_type=True,
+        )
+    except (TypeError, ValueError, OverflowError):
+        # Values such as YAML dates or integers beyond 64 bits have no
+        # msgpack representation
+        return
+
+    tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(packed)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _is_default_config(path: str) -> bool:
+    """Check whether a file holds exactly the embedded default config."""
+    with open(path, "rb") as f:
+        return f.read() == _DEFAULT_CONFIG_BYTES
+
+
+def _parse_cache_key(path: str, st: os.stat_result) -> tuple:
+    """Key identifying one version of a file in the parse cache."""
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _parse_yaml_file(
+    path: str, st: Optional[os.stat_result] = None
+) -> Dict[str, Any]:
+    """Parse a YAML file, reusing the cached result while it is unchanged."""
+    _import_yaml()
+    if st is None:
+        st = os.stat(path)
+    key = _parse_cache_key(path, st)
+
+    with _parse_cache_lock:
+        data = _PARSE_CACHE.get(key)
+        if data is not None:
+            _PARSE_CACHE.move_to_end(key)
+
+    if data is None:
+        if st.st_size == len(_DEFAULT_CONFIG_BYTES) and _is_default_config(path):
+            # An untouched file from create_default_config_file parses to the
+            # embedded defaults, which are parsed at most once per process
+            data = _default_config_data()
+        else:
+            # A fresh msgpack snapshot decodes much faster than YAML parses
+            data = _read_sidecar(path, st)
+            if data is None:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = yaml.load(f, Loader=_SafeLoader) or {}
+                if isinstance(data, dict):
+                    _write_sidecar(path, st, data)
+
+            # Done once per parse; deepcopy shares the interned strings
+            if isinstance(data, dict):
+                _intern_strings(data)
+
+        with _parse_cache_lock:
+            _PARSE_CACHE[key] = data
+            while len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+
+    # Merging hands out nested dicts, so callers get their own copy
+    return copy.deepcopy(data)
+
+
+def _peek_top_level(
+    path: str, keys: List[str], max_bytes: int = 8192
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse only the head of a YAML file to read a few top-level sections.
+
+    Returns None when the head does not settle every requested key, in which
+    case the caller should parse the whole file. A key is only trusted if the
+    whole file fit in the head or another top-level key follows it, since the
+    last section in a truncated head may be cut short.
+    """
+    _import_yaml()
+    with open(path, "rb") as f:
+        head = f.read(max_bytes + 1)
+
+    truncated = len(head) > max_bytes
+    if truncated:
+        # Drop the partial last line so the parser sees whole lines only
+        head = head[: head.rfind(b"\n", 0, max_bytes) + 1]
+
+    try:
+        doc = yaml.load(head, Loader=_SafeLoader)
+    except yaml.YAMLError:
+        return None
+    if not isinstance(doc, dict):
+        return None
+
+    settled = list(doc)[:-1] if truncated else doc
+    if not all(k in settled for k in keys):
+        return None
+    return {k: doc[k] for k in keys}
+
 
 class YAMLConfigProvider(ConfigProvider):
     """YAML file-based configuration provider."""
 
-    def __init__(self, config_paths: Optional[List[str]] = None):
+    def __init__(
+        self, config_paths: Optional[List[str]] = None, use_defaults: bool = False
+    ):
         """
         Initialize YAML config provider.
 
         Args:
             config_paths: List of YAML file paths to load (in order of precedence)
+            use_defaults: Start from the embedded default configuration, with
+                config_paths layered on top
         """
+        _import_yaml()
+
         self.config_data = {}
+        self.use_defaults = use_defaults
+
+        # Memoized get_config results (including misses); cleared on writes
+        self._get_cache: Dict[str, Any] = {}
+
+        # stat results of config_paths from the last load
+        self._stats: Dict[str, Optional[os.stat_result]] = {}
+
+        # Leaf values keyed by full dotted path, rebuilt lazily after writes
+        self._flat: Optional[Dict[str, Any]] = None
+
+        # Whether config_data mappings are in sorted key order for saving
+        self._canonical = False
+
+        # Content digest and file stat of each path save_config wrote
+        self._saved: Dict[str, Tuple[bytes, Tuple[int, int]]] = {}
 
         # Default config paths if none provided
         if config_paths is None:
@@ -30,38 +283,136 @@ class YAMLConfigProvider(ConfigProvider):
         self.config_paths = config_paths
         self._load_configs()
 
+    @classmethod
+    def from_defaults(
+        cls, config_paths: Optional[List[str]] = None
+    ) -> "YAMLConfigProvider":
+        """
+        Create a provider from the embedded default configuration.
+
+        The defaults are parsed once per process, so no default.yaml needs to
+        be written or read.
+
+        Args:
+            config_paths: Optional YAML files to layer over the defaults
+
+        Returns:
+            Configured YAMLConfigProvider
+        """
+        return cls(list(config_paths or []), use_defaults=True)
+
     def _load_configs(self) -> None:
         """Load configuration from YAML files."""
-        for config_path in self.config_paths:
-            if os.path.exists(config_path):
-                try:
-                    with open(config_path, "r", encoding="utf-8") as f:
-                        config_data = yaml.safe_load(f) or {}
+        documents = [get_default_config()] if self.use_defaults else []
+
+        # One stat per path decides existence and keys the parse cache
+        self._stats = {path: _stat_or_none(path) for path in self.config_paths}
+        existing = [p for p in self.config_paths if self._stats[p] is not None]
+
+        def parse(path: str) -> Any:
+            try:
+                return _parse_yaml_file(path, self._stats[path])
+            except Exception as e:
+                return e
+
+        # Cold files are read and parsed concurrently; cached ones are cheap
+        cold = [
+            p
+            for p in existing
+            if _parse_cache_key(p, self._stats[p]) not in _PARSE_CACHE
+        ]
+        parsed = {}
+        if len(cold) > 1:
+            workers = min(_MAX_PARSE_WORKERS, len(cold))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                parsed = dict(zip(cold, executor.map(parse, cold)))
+
+        # Results are merged in path order to keep precedence
+        for config_path in existing:
+            config_data = parsed.get(config_path)
+            if config_data is None:
+                config_data = parse(config_path)
+
+            if isinstance(config_data, dict):
+                documents.append(config_data)
+            else:
+                if not isinstance(config_data, Exception):
+                    config_data = ValueError("top level is not a mapping")
+                print(
+                    f"Warning: Failed to load config file {config_path}: "
+                    f"{config_data}"
+                )
 
-                    # Merge with existing config (later files override earlier ones)
-                    self._deep_merge(self.config_data, config_data)
+        # Merge all files at once (later files override earlier ones)
+        self._nway_merge(self.config_data, documents)
 
-                except Exception as e:
-                    print(f"Warning: Failed to load config file {config_path}: {e}")
+    def _nway_merge(self, target: Dict, sources: List[Dict]) -> None:
+        """
+        Deep merge several dictionaries into target in one pass.
+
+        Equivalent to calling _deep_merge for each source in order, but each
+        key of the merged tree is visited once rather than once per file.
+        """
+        stack = [(target, sources)]
+        while stack:
+            target, sources = stack.pop()
+            if len(sources) == 1:
+                self._deep_merge(target, sources[0])
+                continue
+
+            values: Dict[Any, List[Any]] = {}
+            for source in sources:
+                for key, value in source.items():
+                    values.setdefault(key, []).append(value)
+
+            for key, key_values in values.items():
+                last = key_values[-1]
+                if not isinstance(last, dict):
+                    target[key] = last
+                    continue
+
+                # Only the dicts after the last scalar override take part
+                start = len(key_values) - 1
+                while start > 0 and isinstance(key_values[start - 1], dict):
+                    start -= 1
+                chain = key_values[start:]
+
+                existing = target.get(key)
+                if start == 0 and isinstance(existing, dict):
+                    stack.append((existing, chain))
+                elif len(chain) == 1:
+                    target[key] = last
+                else:
+                    target[key] = merged = {}
+                    stack.append((merged, chain))
 
     def _deep_merge(self, target: Dict, source: Dict) -> None:
         """Deep merge source dictionary into target dictionary."""
-        for key, value in source.items():
-            if (
-                key in target
-                and isinstance(target[key], dict)
-                and isinstance(value, dict)
-            ):
-                self._deep_merge(target[key], value)
-            else:
-                target[key] = value
+        stack = [(target, source)]
+        while stack:
+            target, source = stack.pop()
+            overlap = [
+                key
+                for key, value in source.items()
+                if isinstance(value, dict) and isinstance(target.get(key), dict)
+            ]
+
+            if not overlap:
+                # Common case: nothing to descend into, one C-level update
+                target.update(source)
+                continue
+
+            nested = set(overlap)
+            target.update(
+                {key: value for key, value in source.items() if key not in nested}
+            )
+            stack.extend((target[key], source[key]) for key in overlap)
 
     def _get_nested_value(self, data: Dict, key_path: str, default: Any = None) -> Any:
         """Get value from nested dictionary using dot notation."""
-        keys = key_path.split(".")
         current = data
 
-        for key in keys:
+        for key in _split_key(key_path):
             if isinstance(current, dict) and key in current:
                 current = current[key]
             else:
@@ -71,7 +422,7 @@ class YAMLConfigProvider(ConfigProvider):
 
     def _set_nested_value(self, data: Dict, key_path: str, value: Any) -> None:
         """Set value in nested dictionary using dot notation."""
-        keys = key_path.split(".")
+        keys = _split_key(key_path)
         current = data
 
         # Navigate to the parent of the target key
@@ -87,43 +438,147 @@ class YAMLConfigProvider(ConfigProvider):
 
     def get_config(self, key: str, default: Any = None) -> Any:
         """Get a configuration value by key."""
-        return self._get_nested_value(self.config_data, key, default)
+        try:
+            value = self._get_cache[key]
+        except KeyError:
+            # Leaves take one probe; only sections walk the nested dicts
+            value = self._flat_values().get(key, _MISSING)
+            if value is _MISSING:
+                value = self._get_nested_value(self.config_data, key, _MISSING)
+            self._get_cache[key] = value
+        if value is _MISSING:
+            return default
+        # Hand out copies of containers so callers cannot change config_data
+        # behind the caches' back
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def _flat_values(self) -> Dict[str, Any]:
+        """Return leaf values keyed by dotted path, rebuilding after writes."""
+        if self._flat is None:
+            flat = {}
+            stack = [((), self.config_data)]
+            while stack:
+                prefix, current = stack.pop()
+                for key, value in current.items():
+                    parts = prefix + (str(key),)
+                    if isinstance(value, dict):
+                        stack.append((parts, value))
+                    else:
+                        flat[".".join(parts)] = value
+            self._flat = flat
+        return self._flat
+
+    def _invalidate_caches(self) -> None:
+        """Drop derived lookup structures after config_data changes."""
+        self._get_cache.clear()
+        self._flat = None
+        self._canonical = False
+
+    def _canonicalize(self) -> None:
+        """Sort every mapping in config_data by key, in place."""
+        stack = [self.config_data]
+        while stack:
+            current = stack.pop()
+            try:
+                items = sorted(current.items())
+            except TypeError:
+                # Mixed key types cannot be ordered; keep insertion order
+                items = list(current.items())
+            current.clear()
+            current.update(items)
+            stack.extend(v for _, v in items if isinstance(v, dict))
+        self._canonical = True
 
     def set_config(self, key: str, value: Any) -> bool:
         """Set a configuration value (in memory only)."""
-        try:
-            self._set_nested_value(self.config_data, key, value)
-            return True
-        except Exception:
+        # Anything else is a plain dict walk that cannot fail
+        if not isinstance(key, str) or not key:
             return False
 
+        self._set_nested_value(self.config_data, key, value)
+        self._invalidate_caches()
+        return True
+
     def has_config(self, key: str) -> bool:
         """Check if a configuration key exists."""
-        return self._get_nested_value(self.config_data, key, object()) is not object()
+        if key in self._flat_values():
+            return True
+        # Sections and misses already looked up by get_config need no walk
+        if key in self._get_cache:
+            return self._get_cache[key] is not _MISSING
+        return self._get_nested_value(self.config_data, key, _MISSING) is not _MISSING
 
     def get_section(self, section: str) -> Dict[str, Any]:
         """Get an entire configuration section."""
-        section_data = self._get_nested_value(self.config_data, section, {})
+        section_data = self._get_nested_value(self.config_data, section, _MISSING)
+        # A copy, so edits to it cannot leave the lookup caches stale
+        return copy.deepcopy(section_data) if isinstance(section_data, dict) else {}
+
+    def get_section_fast(self, section: str, config_path: str) -> Dict[str, Any]:
+        """
+        Get a top-level section as defined in a single config file.
+
+        Only the head of the file is parsed when the section appears early
+        enough; otherwise the whole file is parsed. The result reflects that
+        file alone, not the merged configuration.
+        """
+        try:
+            peeked = _peek_top_level(config_path, [section])
+            if peeked is None:
+                peeked = _parse_yaml_file(config_path)
+        except (OSError, yaml.YAMLError):
+            return {}
+
+        section_data = peeked.get(section) if isinstance(peeked, dict) else None
         return section_data if isinstance(section_data, dict) else {}
 
     def list_keys(self, prefix: Optional[str] = None) -> List[str]:
         """List all configuration keys, optionally filtered by prefix."""
-        keys = []
-        self._collect_keys(self.config_data, "", keys)
-
-        if prefix:
+        keys: List[str] = []
+
+        if not prefix:
+            self._collect_keys(self.config_data, keys)
+            return sorted(keys)
+
+        # config_data is already a trie of sections: walk to the section that
+        # holds the prefix and only enumerate the entries that can match
+        parent_path, _, partial = prefix.rpartition(".")
+        parent = (
+            self._get_nested_value(self.config_data, parent_path, _MISSING)
+            if parent_path
+            else self.config_data
+        )
+
+        if isinstance(parent, dict):
+            base = _split_key(parent_path) if parent_path else ()
+            for key, value in parent.items():
+                if not str(key).startswith(partial):
+                    continue
+                parts = base + (str(key),)
+                keys.append(".".join(parts))
+                if isinstance(value, dict) and value:
+                    self._collect_keys(value, keys, parts)
+        else:
+            # Non-string or dotted keys cannot be walked; filter everything
+            self._collect_keys(self.config_data, keys)
             keys = [k for k in keys if k.startswith(prefix)]
 
         return sorted(keys)
 
-    def _collect_keys(self, data: Dict, current_path: str, keys: List[str]) -> None:
-        """Recursively collect all keys from nested dictionary."""
-        for key, value in data.items():
-            full_key = f"{current_path}.{key}" if current_path else key
-            keys.append(full_key)
-
-            if isinstance(value, dict):
-                self._collect_keys(value, full_key, keys)
+    def _collect_keys(
+        self, data: Dict, keys: List[str], prefix: Tuple[str, ...] = ()
+    ) -> None:
+        """Collect all dotted keys from a nested dictionary."""
+        # Paths are carried as tuples and joined once per key
+        stack = [(prefix, data)]
+        while stack:
+            prefix, current = stack.pop()
+            for key, value in current.items():
+                parts = prefix + (str(key),)
+                keys.append(".".join(parts))
+
+                if isinstance(value, dict) and value:
+                    stack.append((parts, value))
 
     def save_config(self, output_path: str) -> bool:
         """
@@ -136,17 +591,49 @@ class YAMLConfigProvider(ConfigProvider):
             True if successful, False otherwise
         """
         try:
+            # config_data is public and may be edited in place, so only the
+            # dumped bytes tell whether it changed since this file was written
+            path = os.path.abspath(output_path)
+            saved = self._saved.get(path)
+            st = _stat_or_none(path)
+            unchanged_on_disk = (
+                saved is not None
+                and st is not None
+                and saved[1] == (st.st_mtime_ns, st.st_size)
+            )
+
             # Ensure directory exists
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-            with open(output_path, "w", encoding="utf-8") as f:
-                yaml.dump(
-                    self.config_data,
-                    f,
-                    default_flow_style=False,
-                    sort_keys=True,
-                    indent=2,
-                )
+            # Sort once per modification so repeated saves dump in linear time
+            if not self._canonical:
+                self._canonicalize()
+
+            data = yaml.dump(
+                self.config_data,
+                Dumper=_SafeDumper,
+                default_flow_style=False,
+                sort_keys=False,
+                indent=2,
+            ).encode("utf-8")
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+
+            # Unchanged or reverted config produces the same bytes; keep the file
+            if not (unchanged_on_disk and saved[0] == digest):
+                # The dump is already one buffer: write it in a single call to
+                # a temp file, then rename so readers never see a partial file
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                try:
+                    with open(tmp_path, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp_path, path)
+                except OSError:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+                    raise
+                st = os.stat(path)
+
+            self._saved[path] = (digest, (st.st_mtime_ns, st.st_size))
             return True
         except Exception:
             return False
@@ -155,6 +642,7 @@ class YAMLConfigProvider(ConfigProvider):
         """Reload configuration from files."""
         try:
             self.config_data = {}
+            self._invalidate_caches()
             self._load_configs()
             return True
         except Exception:
@@ -171,11 +659,13 @@ class YAMLConfigProvider(ConfigProvider):
             True if successful, False otherwise
         """
         try:
-            if os.path.exists(config_path):
-                with open(config_path, "r", encoding="utf-8") as f:
-                    config_data = yaml.safe_load(f) or {}
+            st = _stat_or_none(config_path)
+            if st is not None:
+                config_data = _parse_yaml_file(config_path, st)
+                self._stats[config_path] = st
 
                 self._deep_merge(self.config_data, config_data)
+                self._invalidate_caches()
 
                 if config_path not in self.config_paths:
                     self.config_paths.append(config_path)
@@ -194,8 +684,9 @@ class YAMLConfigProvider(ConfigProvider):
             "total_keys": len(self.list_keys()),
         }
 
+        # Reuse the stat results from the last load
         for path in self.config_paths:
-            if os.path.exists(path):
+            if self._stats.get(path) is not None:
                 info["loaded_files"].append(path)
 
         return info
@@ -319,6 +810,34 @@ logging:
 """
 
 
+_DEFAULT_CONFIG_BYTES = DEFAULT_CONFIG_YAML.encode("utf-8")
+
+_default_config_dict: Optional[Dict[str, Any]] = None
+
+
+def _default_config_data() -> Dict[str, Any]:
+    """Return the shared parsed defaults; callers must not mutate it."""
+    global _default_config_dict
+    if _default_config_dict is None:
+        _import_yaml()
+        _default_config_dict = _intern_strings(
+            yaml.load(DEFAULT_CONFIG_YAML, Loader=_SafeLoader)
+        )
+    return _default_config_dict
+
+
+def get_default_config() -> Dict[str, Any]:
+    """
+    Get the embedded default configuration as a dictionary.
+
+    DEFAULT_CONFIG_YAML is parsed on first use and cached for the process.
+
+    Returns:
+        A fresh copy of the default configuration
+    """
+    return copy.deepcopy(_default_config_data())
+
+
 def create_default_config_file(config_dir: str = "./config") -> bool:
     """
     Create default configuration file if it doesn't exist.
@@ -335,8 +854,16 @@ def create_default_config_file(config_dir: str = "./config") -> bool:
 
         default_file = config_path / "default.yaml"
         if not default_file.exists():
-            with open(default_file, "w", encoding="utf-8") as f:
-                f.write(DEFAULT_CONFIG_YAML)
+            # Write under a per-process name and rename, so concurrent callers
+            # (e.g. parallel test workers) never read a half-written file
+            tmp_file = config_path / f"default.yaml.{os.getpid()}.tmp"
+            try:
+                tmp_file.write_text(DEFAULT_CONFIG_YAML, encoding="utf-8")
+                os.replace(tmp_file, default_file)
+            except OSError:
+                if tmp_file.exists():
+                    tmp_file.unlink()
+                raise
             return True
         return True
     except Exception:
@@ -81,9 +81,11 @@ def main():
     if args.exitfirst:
         base_cmd.append("-x")
 
-    # Add parallel execution
+    # Add parallel execution; keep each file on one worker, since session
+    # fixtures are per worker and some tests build on registrations made by
+    # earlier tests in the same file
     if args.parallel:
-        base_cmd.extend(["-n", "auto"])
+        base_cmd.extend(["-n", "auto", "--dist", "loadfile"])
 
     # Add coverage
     if args.coverage or args.html_coverage:
@@ -40,10 +40,17 @@ setup(
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
+            "pytest-xdist>=3.3.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.0.0",
         ],
+        "orjson": [
+            "orjson>=3.9.0",
+        ],
+        "msgpack": [
+            "msgpack>=1.0.0",
+        ],
         "redis": [
             "redis>=4.5.0",
         ],
@@ -58,6 +65,11 @@ setup(
             "pinecone-client>=2.0.0",
         ],
     },
+    entry_points={
+        "ai_agent.vector_stores": [
+            "chroma = providers.chroma_vector_store:ChromaVectorStore",
+        ],
+    },
     include_package_data=True,
     package_data={
         "": ["*.yaml", "*.yml", "*.json", "*.md"],
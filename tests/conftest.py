@@ -2,13 +2,16 @@
 Pytest configuration and shared fixtures for AI Agent Base tests.
 """
 
-import shutil
-import tempfile
+import hashlib
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict
 from unittest.mock import MagicMock, Mock
 
+import numpy as np
 import pytest
 
 from core.base_config_provider import ConfigProvider
@@ -20,17 +23,28 @@ from core.base_tool import BaseTool, ToolResult
 from core.base_vector_store import Document, VectorStore
 
 
+# Marks a config key that is absent
+_MISSING = object()
+
+
+@lru_cache(maxsize=512)
+def _split_key(key: str) -> tuple:
+    """Split a dotted config key, caching the parts for repeated keys."""
+    return tuple(key.split("."))
+
+
 class MockConfigProvider(ConfigProvider):
     """Mock configuration provider for testing."""
 
     def __init__(self, config_data: Dict[str, Any] = None):
         self.config_data = config_data or {}
+        # Sections found by get_section; cleared by set_config
+        self._section_cache = {}
 
     def get_config(self, key: str, default: Any = None) -> Any:
-        keys = key.split(".")
         current = self.config_data
 
-        for k in keys:
+        for k in _split_key(key):
             if isinstance(current, dict) and k in current:
                 current = current[k]
             else:
@@ -39,7 +53,7 @@ class MockConfigProvider(ConfigProvider):
         return current
 
     def set_config(self, key: str, value: Any) -> bool:
-        keys = key.split(".")
+        keys = _split_key(key)
         current = self.config_data
 
         for k in keys[:-1]:
@@ -48,98 +62,255 @@ class MockConfigProvider(ConfigProvider):
             current = current[k]
 
         current[keys[-1]] = value
+        self._section_cache.clear()
         return True
 
     def has_config(self, key: str) -> bool:
-        return self.get_config(key, object()) is not object()
+        current = self.config_data
+        for k in _split_key(key):
+            if not isinstance(current, dict) or k not in current:
+                return False
+            current = current[k]
+        return True
 
     def get_section(self, section: str) -> Dict[str, Any]:
-        return self.get_config(section, {})
+        try:
+            return self._section_cache[section]
+        except KeyError:
+            pass
+
+        value = self.get_config(section, _MISSING)
+        if value is _MISSING:
+            # Misses hand out a fresh dict each time and are not cached
+            return {}
+        self._section_cache[section] = value
+        return value
 
     def list_keys(self, prefix=None):
+        # Iterative pre-order walk; paths are tuples joined once per key
         keys = []
-        self._collect_keys(self.config_data, "", keys)
-        if prefix:
-            keys = [k for k in keys if k.startswith(prefix)]
+        stack = [((), iter(self.config_data.items()))]
+        while stack:
+            path, items = stack[-1]
+            for key, value in items:
+                parts = path + (str(key),)
+                full_key = ".".join(parts)
+                if not prefix or full_key.startswith(prefix):
+                    keys.append(full_key)
+                if isinstance(value, dict):
+                    stack.append((parts, iter(value.items())))
+                    break
+            else:
+                stack.pop()
         return keys
 
-    def _collect_keys(self, data, current_path, keys):
-        for key, value in data.items():
-            full_key = f"{current_path}.{key}" if current_path else key
-            keys.append(full_key)
-            if isinstance(value, dict):
-                self._collect_keys(value, full_key, keys)
-
 
 class MockVectorStore(VectorStore):
     """Mock vector store for testing."""
 
+    # Deleted slots are compacted once they outnumber this and the live ones
+    _COMPACT_MIN_DEAD = 64
+
     def __init__(self, config=None):
         self.config = config or {}
-        self.documents = {}
         self.next_id = 1
 
+        # Structure-of-arrays columns in insertion order; deleted slots hold
+        # None in _ids until the next compaction
+        self._ids = []
+        self._contents = []
+        self._contents_lower = []
+        self._metadata = []
+        self._id_to_idx = {}
+        self._dead = 0
+
+        # Search arrays built lazily after writes, and metadata key -> value
+        # -> ids for filtered searches
+        self._content_array = None
+        self._live = None
+        self._built = 0
+        self._by_meta = {}
+
     def add_documents(self, documents):
         doc_ids = []
         for doc in documents:
             doc_id = doc.doc_id or f"doc_{self.next_id}"
-            self.documents[doc_id] = doc
+            if doc_id in self._id_to_idx:
+                self._remove(doc_id)
+
+            self._id_to_idx[doc_id] = len(self._ids)
+            self._ids.append(doc_id)
+            self._contents.append(doc.content)
+            self._contents_lower.append(doc.content.lower())
+            self._metadata.append(doc.metadata)
+            for key, value in doc.metadata.items():
+                try:
+                    self._by_meta.setdefault(key, {}).setdefault(value, set()).add(
+                        doc_id
+                    )
+                except TypeError:
+                    # Unhashable values are matched by the scan fallback
+                    pass
+
             doc_ids.append(doc_id)
             self.next_id += 1
+
         return doc_ids
 
-    def similarity_search(self, query, k=5, filters=None):
-        from core.base_vector_store import SearchResult
+    def _remove(self, doc_id):
+        """Tombstone a document's slot and drop it from the metadata index."""
+        idx = self._id_to_idx.pop(doc_id)
+        for key, value in self._metadata[idx].items():
+            try:
+                self._by_meta[key][value].discard(doc_id)
+            except (KeyError, TypeError):
+                pass
+
+        self._ids[idx] = None
+        self._contents[idx] = self._contents_lower[idx] = ""
+        self._metadata[idx] = None
+        self._dead += 1
+        self._content_array = None
+
+    def _compact(self):
+        """Drop tombstoned slots once they dominate the columns."""
+        if self._dead < self._COMPACT_MIN_DEAD or self._dead * 2 < len(self._ids):
+            return
+
+        kept = [i for i, doc_id in enumerate(self._ids) if doc_id is not None]
+        self._ids = [self._ids[i] for i in kept]
+        self._contents = [self._contents[i] for i in kept]
+        self._contents_lower = [self._contents_lower[i] for i in kept]
+        self._metadata = [self._metadata[i] for i in kept]
+        self._id_to_idx = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        self._dead = 0
+        self._content_array = None
+
+    def _doc(self, idx):
+        """Rebuild the Document stored at a slot."""
+        return Document(
+            content=self._contents[idx],
+            metadata=self._metadata[idx],
+            doc_id=self._ids[idx],
+        )
 
-        results = []
+    def _live_positions(self):
+        """Positions of live slots, in insertion order."""
+        if self._dead == 0:
+            return range(len(self._ids))
+        return [i for i, doc_id in enumerate(self._ids) if doc_id is not None]
+
+    def _filter_positions(self, filters):
+        """Positions of documents matching all filters, in insertion order."""
+        candidates = None
+        for key, value in filters.items():
+            ids = None
+            if value is not None:
+                try:
+                    ids = self._by_meta.get(key, {}).get(value, set())
+                except TypeError:
+                    pass  # Unhashable filter value
+            if ids is None:
+                # None also matches documents lacking the key, which the index
+                # cannot list: compare against the candidates so far, or every
+                # document if this is the first filter
+                scope = (
+                    self._live_positions()
+                    if candidates is None
+                    else (self._id_to_idx[i] for i in candidates)
+                )
+                ids = {
+                    self._ids[i]
+                    for i in scope
+                    if self._metadata[i].get(key) == value
+                }
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return np.empty(0, dtype=np.intp)
+        return np.sort(
+            np.fromiter((self._id_to_idx[i] for i in candidates), dtype=np.intp)
+        )
 
-        for doc_id, doc in list(self.documents.items())[:k]:
-            if filters:
-                match = True
-                for key, value in filters.items():
-                    if doc.metadata.get(key) != value:
-                        match = False
-                        break
-                if not match:
-                    continue
+    def similarity_search(self, query, k=5, filters=None):
+        from core.base_vector_store import SearchResult
 
-            # Simple similarity based on query presence in content
-            score = 0.8 if query.lower() in doc.content.lower() else 0.3
-            results.append(SearchResult(document=doc, score=score))
+        if not self._id_to_idx:
+            return []
+        if self._content_array is None:
+            # Only live slots go into the search array, so unfiltered searches
+            # scan it in place rather than gathering a copy per query
+            self._live = np.fromiter(self._live_positions(), dtype=np.intp)
+            self._content_array = np.array(
+                [self._contents_lower[i] for i in self._live.tolist()], dtype=str
+            )
+            self._built = len(self._ids)
+        elif self._built < len(self._ids):
+            # Appends since the last build are all live (removals drop the
+            # arrays), so extend them with the new tail instead of rebuilding
+            tail = self._contents_lower[self._built :]
+            self._live = np.concatenate(
+                [self._live, np.arange(self._built, len(self._ids), dtype=np.intp)]
+            )
+            self._content_array = np.concatenate(
+                [self._content_array, np.array(tail, dtype=str)]
+            )
+            self._built = len(self._ids)
 
-        return sorted(results, key=lambda x: x.score, reverse=True)
+        if filters:
+            positions = self._filter_positions(filters)
+            contents = self._content_array[np.searchsorted(self._live, positions)]
+        else:
+            positions = self._live
+            contents = self._content_array
+
+        # Simple similarity based on query presence in content; with only two
+        # scores, hits then misses (each in insertion order) is the ranking.
+        # Only the k positions that are returned are gathered.
+        found = np.char.find(contents, query.lower()) >= 0
+        hits = positions[np.flatnonzero(found)[:k]].tolist()
+        misses = []
+        if len(hits) < k:
+            misses = positions[np.flatnonzero(~found)[: k - len(hits)]].tolist()
+
+        return [SearchResult(document=self._doc(i), score=0.8) for i in hits] + [
+            SearchResult(document=self._doc(i), score=0.3) for i in misses
+        ]
 
     def delete_documents(self, doc_ids):
         for doc_id in doc_ids:
-            self.documents.pop(doc_id, None)
+            if doc_id in self._id_to_idx:
+                self._remove(doc_id)
+        self._compact()
         return True
 
     def get_document(self, doc_id):
-        return self.documents.get(doc_id)
+        idx = self._id_to_idx.get(doc_id)
+        return None if idx is None else self._doc(idx)
+
+    def _matching_positions(self, filters):
+        """Live positions whose metadata matches every filter."""
+        positions = self._live_positions()
+        if not filters:
+            return iter(positions)
+        items = filters.items()
+        return (
+            i
+            for i in positions
+            if all(self._metadata[i].get(key) == value for key, value in items)
+        )
 
     def list_documents(self, filters=None, limit=None, offset=None):
-        docs = list(self.documents.values())
-        if filters:
-            filtered_docs = []
-            for doc in docs:
-                match = True
-                for key, value in filters.items():
-                    if doc.metadata.get(key) != value:
-                        match = False
-                        break
-                if match:
-                    filtered_docs.append(doc)
-            docs = filtered_docs
-
-        if offset:
-            docs = docs[offset:]
-        if limit:
-            docs = docs[:limit]
-
-        return docs
+        # One pass: filter, skip and stop lazily; only the page is rebuilt
+        positions = self._matching_positions(filters)
+        if offset or limit:
+            start = offset or 0
+            positions = islice(positions, start, start + limit if limit else None)
+        return [self._doc(i) for i in positions]
 
     def count_documents(self, filters=None):
-        return len(self.list_documents(filters))
+        if not filters:
+            return len(self._id_to_idx)
+        return sum(1 for _ in self._matching_positions(filters))
 
 
 class MockLLMProvider(LLMProvider):
@@ -147,19 +318,38 @@ class MockLLMProvider(LLMProvider):
 
     def __init__(self, config=None, responses=None):
         self.config = config or {}
-        self.responses = responses or ["This is a mock response."]
+        self._initial_responses = responses or ["This is a mock response."]
+        self.responses = self._initial_responses
+        self.call_count = 0
+
+    @property
+    def responses(self):
+        return self._responses
+
+    @responses.setter
+    def responses(self, responses):
+        # Each LLMResponse is built once per assignment and shared; callers
+        # only read them
+        self._responses = responses
+        self._prebuilt = [
+            LLMResponse(
+                content=response,
+                model="mock-model",
+                usage={"tokens": len(response.split())},
+                metadata={"mock": True},
+            )
+            for response in responses
+        ]
+
+    def reset(self):
+        """Return the provider to its freshly constructed state."""
+        self.responses = self._initial_responses
         self.call_count = 0
 
     def generate(self, messages, **kwargs):
-        response = self.responses[self.call_count % len(self.responses)]
+        response = self._prebuilt[self.call_count % len(self._prebuilt)]
         self.call_count += 1
-
-        return LLMResponse(
-            content=response,
-            model="mock-model",
-            usage={"tokens": len(response.split())},
-            metadata={"mock": True},
-        )
+        return response
 
     def generate_stream(self, messages, **kwargs):
         response = self.responses[self.call_count % len(self.responses)]
@@ -184,6 +374,13 @@ class MockLLMProvider(LLMProvider):
         return False
 
 
+@lru_cache(maxsize=4096)
+def _mock_embed(text: str) -> tuple:
+    """Deterministic mock embedding derived from the text hash."""
+    hash_val = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+    return (float(hash_val % 100) / 100,) * 10
+
+
 class MockEmbeddingProvider(EmbeddingProvider):
     """Mock embedding provider for testing."""
 
@@ -191,14 +388,18 @@ class MockEmbeddingProvider(EmbeddingProvider):
         self.config = config or {}
 
     def embed_text(self, text, **kwargs):
-        # Simple mock embedding based on text hash
-        import hashlib
-
-        hash_val = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
-        return [float(hash_val % 100) / 100 for _ in range(10)]
+        # Simple mock embedding based on text hash, cached per text
+        return list(_mock_embed(text))
 
     def embed_documents(self, texts, **kwargs):
-        embeddings = [self.embed_text(text) for text in texts]
+        # Every component of a mock embedding is the same scalar, so the batch
+        # is one column broadcast to the embedding dimension in a single step
+        values = np.fromiter(
+            (_mock_embed(text)[0] for text in texts),
+            dtype=np.float64,
+            count=len(texts),
+        )
+        embeddings = np.repeat(values[:, None], 10, axis=1).tolist()
 
         return EmbeddingResult(
             embeddings=embeddings,
@@ -206,6 +407,10 @@ class MockEmbeddingProvider(EmbeddingProvider):
             usage={"tokens": sum(len(text.split()) for text in texts)},
         )
 
+    def reset(self):
+        """Return the provider to its freshly constructed state."""
+        # Stateless apart from its config; kept for the fixture pool
+
     def get_embedding_dimension(self):
         return 10
 
@@ -237,6 +442,12 @@ class MockTool(BaseTool):
         self.last_input = None
         self.last_kwargs = None
 
+    def reset(self):
+        """Return the tool to its freshly constructed state."""
+        self.call_count = 0
+        self.last_input = None
+        self.last_kwargs = None
+
     @property
     def name(self):
         return self._name
@@ -260,11 +471,14 @@ class MockTool(BaseTool):
 
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+def temp_dir(tmp_path_factory):
+    """
+    Create a temporary directory for tests.
+
+    Directories live under pytest's per-session base temp, which pytest prunes
+    itself, so tests do not pay for an rmtree each.
+    """
+    return str(tmp_path_factory.mktemp("test"))
 
 
 @pytest.fixture
@@ -296,28 +510,43 @@ def mock_vector_store():
     return MockVectorStore()
 
 
+@pytest.fixture(scope="session")
+def _mock_pool():
+    """Default-constructed mocks kept for reuse, keyed by class."""
+    return defaultdict(list)
+
+
+def _pooled(pool, cls):
+    """Lend a pooled instance of cls for one test, resetting it on return."""
+    instances = pool[cls]
+    instance = instances.pop() if instances else cls()
+    yield instance
+    instance.reset()
+    instances.append(instance)
+
+
 @pytest.fixture
-def mock_llm_provider():
+def mock_llm_provider(_mock_pool):
     """Create a mock LLM provider."""
-    return MockLLMProvider()
+    yield from _pooled(_mock_pool, MockLLMProvider)
 
 
 @pytest.fixture
-def mock_embedding_provider():
+def mock_embedding_provider(_mock_pool):
     """Create a mock embedding provider."""
-    return MockEmbeddingProvider()
+    yield from _pooled(_mock_pool, MockEmbeddingProvider)
 
 
 @pytest.fixture
-def mock_tool():
+def mock_tool(_mock_pool):
     """Create a mock tool."""
-    return MockTool()
+    yield from _pooled(_mock_pool, MockTool)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_documents():
-    """Create sample documents for testing."""
-    return [
+    """Create sample documents for testing (shared, so returned as a tuple)."""
+    return (
         Document(
             content="This is a test document about Python programming.",
             metadata={"type": "programming", "language": "python"},
@@ -333,28 +562,32 @@ def sample_documents():
             metadata={"type": "web", "framework": "flask"},
             doc_id="doc3",
         ),
-    ]
+    )
 
 
-@pytest.fixture
-def sample_chat_messages():
-    """Create sample chat messages for testing."""
-    now = datetime.now()
+# Fixed timestamp for shared sample data
+_SAMPLE_TIMESTAMP = datetime(2024, 1, 1)
 
-    return [
-        ChatMessage(role="user", content="Hello", timestamp=now),
-        ChatMessage(role="assistant", content="Hi there!", timestamp=now),
-        ChatMessage(role="user", content="How are you?", timestamp=now),
-        ChatMessage(role="assistant", content="I'm doing well, thanks!", timestamp=now),
-    ]
 
-
-@pytest.fixture
+@pytest.fixture(scope="session")
+def sample_chat_messages():
+    """Create sample chat messages for testing (shared, so returned as a tuple)."""
+    return tuple(
+        ChatMessage(role=role, content=content, timestamp=_SAMPLE_TIMESTAMP)
+        for role, content in [
+            ("user", "Hello"),
+            ("assistant", "Hi there!"),
+            ("user", "How are you?"),
+            ("assistant", "I'm doing well, thanks!"),
+        ]
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
 def mock_components():
-    """Set up mock components for integration testing."""
+    """Register mock components once for the whole test session."""
     from core.component_factory import ComponentFactory
 
-    # Register mock implementations
     ComponentFactory.register_vector_store("mock", MockVectorStore)
     ComponentFactory.register_llm_provider("mock", MockLLMProvider)
     ComponentFactory.register_embedding_provider("mock", MockEmbeddingProvider)
@@ -369,12 +602,11 @@ def mock_components():
     ComponentFactory.register_document_store("mock", FileSystemDocumentStore)
 
 
-@pytest.fixture
-def test_config(temp_dir):
-    """Create test configuration."""
+def make_test_config(document_path):
+    """Build the integration test configuration around a document directory."""
     config_data = {
         "vector_store": {"type": "mock"},
-        "document_store": {"type": "mock", "path": temp_dir},
+        "document_store": {"type": "mock", "path": document_path},
         "memory": {"type": "mock", "max_sessions": 10},
         "llm": {"type": "mock", "model": "mock-model"},
         "embedding": {"type": "mock", "model": "mock-embedding"},
@@ -392,48 +624,76 @@ def test_config(temp_dir):
 
 
 @pytest.fixture
-def api_client(mock_components):
-    """Create a test client for the Flask API."""
+def test_config(temp_dir):
+    """Create test configuration."""
+    return make_test_config(temp_dir)
+
+
+# Environment the API app is created and exercised under
+_API_TEST_ENV = {"OPENAI_API_KEY": "test-key", "CONFIG_ENV": "test"}
+
+
+@pytest.fixture(scope="session")
+def agent_api(mock_components):
+    """Create the AgentAPI once per test session."""
     try:
         import os
         from unittest.mock import patch
 
         from api.server import create_app
 
-        # Set up test configuration environment
-        test_env = {"OPENAI_API_KEY": "test-key", "CONFIG_ENV": "test"}
+        with patch.dict(os.environ, _API_TEST_ENV):
+            # Create app with test configuration
+            test_config_path = "./config/test.yaml"
+            agent_api = create_app(config_path=test_config_path)
 
-        with patch.dict(os.environ, test_env):
-            # Ensure mock components are registered BEFORE creating the app
-            from core.component_factory import ComponentFactory
+        # Set Flask's built-in TESTING config
+        agent_api.app.testing = True
 
-            ComponentFactory.register_vector_store("mock", MockVectorStore)
-            ComponentFactory.register_llm_provider("mock", MockLLMProvider)
-            ComponentFactory.register_embedding_provider("mock", MockEmbeddingProvider)
-            ComponentFactory.register_tool("mock_tool", MockTool)
+        return agent_api
+    except ImportError as e:
+        pytest.skip(f"API server import failed: {e}")
 
-            from providers.in_memory_backend import InMemoryBackend
 
-            ComponentFactory.register_memory_backend("mock", InMemoryBackend)
+@pytest.fixture(scope="session")
+def api_app(agent_api):
+    """The Flask app behind the shared AgentAPI."""
+    return agent_api.app
 
-            from providers.filesystem_document_store import FileSystemDocumentStore
 
-            ComponentFactory.register_document_store("mock", FileSystemDocumentStore)
+@pytest.fixture(scope="session")
+def api_client(api_app):
+    """Create one test client for the Flask API, shared across the session."""
+    # The API is stateless JSON, so the shared client keeps no cookie jar that
+    # could carry state from one test into the next
+    return api_app.test_client(use_cookies=False)
 
-            # Create app with test configuration
-            test_config_path = "./config/test.yaml"
-            agent_api = create_app(config_path=test_config_path)
 
-            # Get the Flask app from AgentAPI
-            app = agent_api.app
+@pytest.fixture
+def mock_agent():
+    """Create a GeneralAgent mock with the real agent's interface."""
+    from unittest.mock import create_autospec
 
-            # Set Flask's built-in TESTING config
-            app.testing = True
+    from agents.general_agent import GeneralAgent
 
-            with app.test_client() as client:
-                yield client
-    except ImportError as e:
-        pytest.skip(f"API server import failed: {e}")
+    return create_autospec(GeneralAgent, instance=True)
+
+
+@pytest.fixture
+def patched_api(agent_api, api_client, mock_agent, monkeypatch):
+    """Serve the general agent from mock_agent for the duration of a test."""
+    monkeypatch.setitem(agent_api.agents, "general", mock_agent)
+    return api_client
+
+
+@pytest.fixture
+def api_env():
+    """Apply the API test environment for the duration of a test."""
+    import os
+    from unittest.mock import patch
+
+    with patch.dict(os.environ, _API_TEST_ENV):
+        yield
 
 
 # Pytest markers for different test types
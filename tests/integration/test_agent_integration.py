@@ -8,22 +8,44 @@ import pytest
 
 from agents.general_agent import GeneralAgent
 from core.base_agent import AgentResponse, BaseAgent
-from core.component_factory import ComponentFactory
 from tests.conftest import (
     MockConfigProvider,
     MockEmbeddingProvider,
     MockLLMProvider,
     MockVectorStore,
+    make_test_config,
 )
 
 
+@pytest.fixture(scope="module")
+def agent(tmp_path_factory):
+    """
+    GeneralAgent shared by the tests in this module.
+
+    Tests using it must only touch sessions and documents they create
+    themselves; tests that reconfigure an agent build their own.
+    """
+    return GeneralAgent(make_test_config(str(tmp_path_factory.mktemp("agent"))))
+
+
+@pytest.fixture(scope="module")
+def two_agent_config(tmp_path_factory):
+    """Test configuration that also defines a second agent type."""
+    config = make_test_config(str(tmp_path_factory.mktemp("two_agents")))
+    config.config_data["agents"]["test_agent"] = {
+        "system_prompt": "You are a test agent.",
+        "tools": [],
+        "rag_settings": {"top_k": 5},
+        "llm_settings": {"temperature": 0.5},
+    }
+    return config
+
+
 class TestAgentIntegration:
     """Integration tests for agent components working together."""
 
-    def test_agent_initialization(self, mock_components, test_config):
+    def test_agent_initialization(self, agent):
         """Test agent initialization with all components."""
-        agent = GeneralAgent(test_config)
-
         assert agent.agent_type == "general"
         assert agent.vector_store is not None
         assert agent.document_store is not None
@@ -31,10 +53,8 @@ class TestAgentIntegration:
         assert agent.llm_provider is not None
         assert agent.embedding_provider is not None
 
-    def test_agent_process_query_simple(self, mock_components, test_config):
+    def test_agent_process_query_simple(self, agent):
         """Test basic query processing."""
-        agent = GeneralAgent(test_config)
-
         response = agent.process_query("Hello, how are you?")
 
         assert isinstance(response, AgentResponse)
@@ -43,9 +63,8 @@ class TestAgentIntegration:
         assert response.timestamp is not None
         assert response.metadata.get("agent_type") == "general"
 
-    def test_agent_process_query_with_session(self, mock_components, test_config):
+    def test_agent_process_query_with_session(self, agent):
         """Test query processing with session continuity."""
-        agent = GeneralAgent(test_config)
         session_id = "test_session_123"
 
         # First query
@@ -61,10 +80,8 @@ class TestAgentIntegration:
         assert session_info is not None
         assert session_info.message_count >= 2
 
-    def test_agent_with_documents(self, mock_components, test_config):
+    def test_agent_with_documents(self, agent):
         """Test agent with document knowledge base."""
-        agent = GeneralAgent(test_config)
-
         # Add a document
         doc_id = agent.add_document(
             content="Python is a programming language known for its simplicity.",
@@ -80,9 +97,8 @@ class TestAgentIntegration:
         # The mock implementation should find the document
         assert len(response.sources) >= 0  # Depends on mock behavior
 
-    def test_agent_memory_persistence(self, mock_components, test_config):
+    def test_agent_memory_persistence(self, agent):
         """Test that agent memory persists across queries."""
-        agent = GeneralAgent(test_config)
         session_id = "memory_test_session"
 
         # Send multiple queries
@@ -105,10 +121,8 @@ class TestAgentIntegration:
             session_info.message_count == len(queries) * 2
         )  # User + assistant messages
 
-    def test_agent_error_handling(self, mock_components, test_config):
+    def test_agent_error_handling(self, agent):
         """Test agent error handling."""
-        agent = GeneralAgent(test_config)
-
         # Test with problematic input
         response = agent.process_query("")  # Empty query
 
@@ -116,10 +130,8 @@ class TestAgentIntegration:
         assert isinstance(response, AgentResponse)
         assert response.content is not None
 
-    def test_agent_session_management(self, mock_components, test_config):
+    def test_agent_session_management(self, agent):
         """Test session creation and deletion."""
-        agent = GeneralAgent(test_config)
-
         # Create session
         response = agent.process_query("Test message")
         session_id = response.session_id
@@ -136,10 +148,8 @@ class TestAgentIntegration:
         session_info = agent.get_session_history(session_id)
         assert session_info is None
 
-    def test_agent_info(self, mock_components, test_config):
+    def test_agent_info(self, agent):
         """Test getting agent information."""
-        agent = GeneralAgent(test_config)
-
         info = agent.get_agent_info()
 
         assert "agent_type" in info
@@ -151,20 +161,10 @@ class TestAgentIntegration:
         assert info["agent_type"] == "general"
         assert "component_info" in info
 
-    def test_multiple_agents_isolation(self, mock_components, test_config):
+    def test_multiple_agents_isolation(self, agent, two_agent_config):
         """Test that multiple agents don't interfere with each other."""
-        # Create config for second agent
-        config_data = test_config.config_data.copy()
-        config_data["agents"]["test_agent"] = {
-            "system_prompt": "You are a test agent.",
-            "tools": [],
-            "rag_settings": {"top_k": 5},
-            "llm_settings": {"temperature": 0.5},
-        }
-        test_config2 = MockConfigProvider(config_data)
-
-        # Create two different agents
-        agent1 = GeneralAgent(test_config)
+        # Two different agents
+        agent1 = agent
 
         # Create a simple test agent
         class TestAgent(BaseAgent):
@@ -174,7 +174,7 @@ class TestAgentIntegration:
             def _build_system_prompt(self, relevant_context, context):
                 return "You are a test agent."
 
-        agent2 = TestAgent(test_config2)
+        agent2 = TestAgent(two_agent_config)
 
         # Test they have different configurations
         assert agent1.agent_type == "general"
@@ -191,17 +191,10 @@ class TestAgentWithTools:
     """Integration tests for agents with tools."""
 
     @pytest.fixture
-    def agent_with_tools(self, mock_components, test_config):
+    def agent_with_tools(self, test_config):
         """Create agent with mock tools."""
-        from tests.conftest import MockTool
-
-        # Register mock tool
-        ComponentFactory.register_tool("mock_tool", MockTool)
-
-        # Update config to include tools
-        test_config.set_config("agents.general.tools", ["mock_tool"])
-        test_config.set_config("tools.mock_tool.type", "mock_tool")
-
+        # mock_tool is registered for the session by mock_components and the
+        # test config already wires it into the general agent
         return GeneralAgent(test_config)
 
     def test_agent_tool_execution(self, agent_with_tools):
@@ -239,10 +232,8 @@ class TestAgentEdgeCases:
         with pytest.raises(Exception):  # Expect some kind of initialization error
             GeneralAgent(invalid_config)
 
-    def test_agent_query_with_special_characters(self, mock_components, test_config):
+    def test_agent_query_with_special_characters(self, agent):
         """Test agent handling special characters in queries."""
-        agent = GeneralAgent(test_config)
-
         special_queries = [
             "Hello! How are you? 😊",
             "Test with émojis and àccents",
@@ -255,10 +246,8 @@ class TestAgentEdgeCases:
             assert isinstance(response, AgentResponse)
             assert response.content is not None
 
-    def test_agent_very_long_query(self, mock_components, test_config):
+    def test_agent_very_long_query(self, agent):
         """Test agent with very long query."""
-        agent = GeneralAgent(test_config)
-
         # Create very long query
         long_query = "This is a very long query. " * 1000
 
@@ -267,18 +256,22 @@ class TestAgentEdgeCases:
         assert isinstance(response, AgentResponse)
         # Should handle gracefully (might truncate or summarize)
 
-    def test_agent_concurrent_queries(self, mock_components, test_config):
+    def test_agent_concurrent_queries(self, test_config):
         """Test concurrent queries to same agent."""
         import threading
-        import time
 
         agent = GeneralAgent(test_config)
-        results = []
+        results = {}
+        lock = threading.Lock()
+
+        # Release all workers together so the queries actually overlap
+        barrier = threading.Barrier(5)
 
         def worker(query_id):
+            barrier.wait(timeout=10)
             response = agent.process_query(f"Query {query_id}")
-            results.append((query_id, response.session_id))
-            time.sleep(0.01)
+            with lock:
+                results[query_id] = response.session_id
 
         # Run concurrent queries
         threads = [threading.Thread(target=worker, args=(i,)) for i in range(5)]
@@ -289,9 +282,6 @@ class TestAgentEdgeCases:
         for thread in threads:
             thread.join()
 
-        # All queries should complete successfully
+        # All queries should complete, each with a unique session ID
         assert len(results) == 5
-
-        # Each should have unique session IDs
-        session_ids = [result[1] for result in results]
-        assert len(set(session_ids)) == 5  # All unique
+        assert len(set(results.values())) == 5
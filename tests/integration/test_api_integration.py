@@ -2,12 +2,13 @@
 Integration tests for Flask API endpoints.
 """
 
-import json
-from unittest.mock import Mock, patch
-
 import pytest
 
 
+# The shared client outlives each test, so the environment is applied per test
+pytestmark = pytest.mark.usefixtures("api_env")
+
+
 class TestAPIIntegration:
     """Integration tests for the Flask API."""
 
@@ -17,7 +18,7 @@ class TestAPIIntegration:
 
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "status" in data
         assert "timestamp" in data
         assert "agents" in data
@@ -29,7 +30,7 @@ class TestAPIIntegration:
 
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "agents" in data
         assert "count" in data
         assert isinstance(data["agents"], dict)
@@ -44,23 +45,13 @@ class TestAPIIntegration:
 
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "response" in data
         assert "session_id" in data
         # Our MockLLMProvider returns "This is a mock response."
         assert data["response"] == "This is a mock response."
         assert data["session_id"] == "test_session"
 
-    def test_chat_endpoint_missing_message(self, api_client):
-        """Test chat endpoint with missing message."""
-        response = api_client.post("/agents/general/chat", json={"session_id": "test"})
-
-        assert response.status_code == 400
-
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "required" in data["error"].lower()
-
     def test_chat_endpoint_invalid_agent(self, api_client):
         """Test chat endpoint with invalid agent type."""
         response = api_client.post(
@@ -69,7 +60,7 @@ class TestAPIIntegration:
 
         assert response.status_code == 404
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "error" in data
         assert "not found" in data["error"].lower()
 
@@ -80,7 +71,7 @@ class TestAPIIntegration:
         # Returns 415 due to UnsupportedMediaType exception in Flask
         assert response.status_code == 415
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "error" in data
 
     def test_get_session_endpoint(self, api_client):
@@ -97,44 +88,33 @@ class TestAPIIntegration:
 
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["session_id"] == "test_session"
         assert data["agent_type"] == "general"
         assert data["message_count"] >= 1
 
-    @patch("agents.general_agent.GeneralAgent")
-    def test_get_session_not_found(self, mock_agent_class, api_client):
+    def test_get_session_not_found(self, patched_api, mock_agent):
         """Test getting non-existent session."""
-        mock_agent = Mock()
         mock_agent.get_session_history.return_value = None
-        mock_agent_class.return_value = mock_agent
-
-        with patch("api.server.AgentAPI._initialize_agents") as mock_init:
-            mock_init.return_value = {"general": mock_agent}
 
-            response = api_client.get("/agents/general/sessions/nonexistent")
+        response = patched_api.get("/agents/general/sessions/nonexistent")
 
         assert response.status_code == 404
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "error" in data
         assert "not found" in data["error"].lower()
 
-    @patch("agents.general_agent.GeneralAgent")
-    def test_delete_session_endpoint(self, mock_agent_class, api_client):
+    def test_delete_session_endpoint(self, patched_api, mock_agent):
         """Test deleting a session."""
-        mock_agent = Mock()
         mock_agent.delete_session.return_value = True
-        mock_agent_class.return_value = mock_agent
 
-        with patch("api.server.AgentAPI._initialize_agents") as mock_init:
-            mock_init.return_value = {"general": mock_agent}
-
-            response = api_client.delete("/agents/general/sessions/test_session")
+        response = patched_api.delete("/agents/general/sessions/test_session")
 
         assert response.status_code == 200
+        mock_agent.delete_session.assert_called_once_with("test_session")
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "message" in data
         assert "deleted" in data["message"].lower()
 
@@ -154,7 +134,7 @@ class TestAPIIntegration:
 
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "sessions" in data
         assert "count" in data
         assert "limit" in data
@@ -173,47 +153,36 @@ class TestAPIIntegration:
             assert "last_active" in session
             assert "message_count" in session
 
-    def test_add_document_endpoint(self, api_client):
+    def test_add_document_endpoint(self, patched_api, mock_agent):
         """Test adding a document."""
-        # Mock the add_document method on the GeneralAgent class
-        with patch(
-            "agents.general_agent.GeneralAgent.add_document", return_value="doc_123"
-        ):
-            response = api_client.post(
-                "/agents/general/documents",
-                json={
-                    "content": "Test document content",
-                    "metadata": {"type": "test"},
-                    "file_path": "/path/to/doc.txt",
-                },
-            )
+        mock_agent.add_document.return_value = "doc_123"
+
+        response = patched_api.post(
+            "/agents/general/documents",
+            json={
+                "content": "Test document content",
+                "metadata": {"type": "test"},
+                "file_path": "/path/to/doc.txt",
+            },
+        )
 
         assert response.status_code == 201
+        mock_agent.add_document.assert_called_once_with(
+            "Test document content", {"type": "test"}, "/path/to/doc.txt"
+        )
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "document_id" in data
         assert data["document_id"] == "doc_123"
         assert "message" in data
 
-    def test_add_document_missing_content(self, api_client):
-        """Test adding document without content."""
-        response = api_client.post(
-            "/agents/general/documents", json={"metadata": {"type": "test"}}
-        )
-
-        assert response.status_code == 400
-
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "required" in data["error"].lower()
-
     def test_list_tools_endpoint(self, api_client):
         """Test listing tools for an agent."""
         response = api_client.get("/agents/general/tools")
 
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "tools" in data
         assert "tool_details" in data
         assert "count" in data
@@ -235,31 +204,19 @@ class TestAPIIntegration:
 
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["success"] is True
         assert "content" in data
         assert data["content"] == "Mock tool executed successfully"
         assert "metadata" in data
 
-    def test_execute_tool_missing_input(self, api_client):
-        """Test executing tool without input."""
-        response = api_client.post(
-            "/agents/general/tools/calculator", json={"parameters": {}}
-        )
-
-        assert response.status_code == 400
-
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "required" in data["error"].lower()
-
     def test_get_config_endpoint(self, api_client):
         """Test getting sanitized configuration."""
         response = api_client.get("/config")
 
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "vector_store" in data
         assert "memory" in data
         assert "llm" in data
@@ -269,62 +226,34 @@ class TestAPIIntegration:
         # Should not contain sensitive information
         assert "api_key" not in str(data)
 
-    def test_404_endpoint(self, api_client):
-        """Test 404 error handling."""
-        response = api_client.get("/nonexistent/endpoint")
-
-        assert response.status_code == 404
-
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "not found" in data["error"].lower()
-
-    def test_405_method_not_allowed(self, api_client):
-        """Test 405 error handling."""
-        response = api_client.patch("/health")  # PATCH not allowed on health
-
-        assert response.status_code == 405
-
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "not allowed" in data["error"].lower()
-
 
 class TestAPIErrorHandling:
     """Test API error handling scenarios."""
 
-    def test_chat_endpoint_agent_error(self, api_client):
+    def test_chat_endpoint_agent_error(self, patched_api, mock_agent):
         """Test chat endpoint when agent raises exception."""
-        # Mock the process_query method to raise an exception
-        with patch(
-            "agents.general_agent.GeneralAgent.process_query",
-            side_effect=Exception("Agent error"),
-        ):
-            response = api_client.post(
-                "/agents/general/chat", json={"message": "Hello"}
-            )
+        mock_agent.process_query.side_effect = Exception("Agent error")
+
+        response = patched_api.post("/agents/general/chat", json={"message": "Hello"})
 
         assert response.status_code == 500
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "error" in data
         assert "internal server error" in data["error"].lower()
 
-    def test_add_document_agent_error(self, api_client):
+    def test_add_document_agent_error(self, patched_api, mock_agent):
         """Test add document endpoint when agent raises exception."""
-        # Mock the add_document method to raise an exception
-        with patch(
-            "agents.general_agent.GeneralAgent.add_document",
-            side_effect=Exception("Document error"),
-        ):
-            response = api_client.post(
-                "/agents/general/documents",
-                json={"content": "Test content", "metadata": {}},
-            )
+        mock_agent.add_document.side_effect = Exception("Document error")
+
+        response = patched_api.post(
+            "/agents/general/documents",
+            json={"content": "Test content", "metadata": {}},
+        )
 
         assert response.status_code == 500
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "error" in data
 
     def test_invalid_json(self, api_client):
@@ -339,64 +268,65 @@ class TestAPIErrorHandling:
 class TestAPIValidation:
     """Test API input validation."""
 
-    def test_chat_empty_message(self, api_client):
-        """Test chat with empty message."""
-        response = api_client.post("/agents/general/chat", json={"message": ""})
-
-        assert response.status_code == 400
-
-    def test_chat_whitespace_only_message(self, api_client):
-        """Test chat with whitespace-only message."""
-        response = api_client.post("/agents/general/chat", json={"message": "   "})
+    @pytest.mark.parametrize(
+        "url,payload",
+        [
+            ("/agents/general/chat", {"session_id": "test"}),
+            ("/agents/general/chat", {"message": ""}),
+            ("/agents/general/chat", {"message": "   "}),
+            ("/agents/general/documents", {"metadata": {"type": "test"}}),
+            ("/agents/general/documents", {"content": "", "metadata": {}}),
+            ("/agents/general/tools/calculator", {"parameters": {}}),
+            ("/agents/general/tools/calculator", {"input": ""}),
+        ],
+        ids=[
+            "chat-missing-message",
+            "chat-empty-message",
+            "chat-whitespace-message",
+            "document-missing-content",
+            "document-empty-content",
+            "tool-missing-input",
+            "tool-empty-input",
+        ],
+    )
+    def test_missing_or_empty_input_rejected(self, api_client, url, payload):
+        """Test that missing, empty or blank required fields are rejected."""
+        response = api_client.post(url, json=payload)
 
         assert response.status_code == 400
 
-    def test_add_document_empty_content(self, api_client):
-        """Test adding document with empty content."""
-        response = api_client.post(
-            "/agents/general/documents", json={"content": "", "metadata": {}}
-        )
-
-        assert response.status_code == 400
+        data = response.get_json()
+        assert "error" in data
+        assert "required" in data["error"].lower()
 
-    def test_execute_tool_empty_input(self, api_client):
-        """Test executing tool with empty input."""
-        response = api_client.post(
-            "/agents/general/tools/calculator", json={"input": ""}
-        )
 
-        assert response.status_code == 400
+class TestAPIHTTPSurface:
+    """Test routing errors, CORS and content types."""
 
+    def test_error_surface(self, api_client):
+        """Test 404/405 handling, CORS preflight and JSON content types."""
+        response = api_client.get("/nonexistent/endpoint")
+        assert response.status_code == 404, "404 endpoint"
+        assert "not found" in response.get_json()["error"].lower(), "404 endpoint"
 
-class TestAPICORS:
-    """Test CORS functionality."""
+        # PATCH not allowed on health
+        response = api_client.patch("/health")
+        assert response.status_code == 405, "405 method not allowed"
+        error = response.get_json()["error"].lower()
+        assert "not allowed" in error, "405 method not allowed"
 
-    def test_cors_headers_present(self, api_client):
-        """Test that CORS headers are present."""
+        # This depends on Flask-CORS configuration
         response = api_client.options("/health")
+        assert response.status_code in [200, 204], "CORS preflight"
 
-        # CORS headers should be present if enabled
-        # This test depends on Flask-CORS configuration
-        assert response.status_code in [200, 204]  # OPTIONS requests
-
-
-class TestAPIContentTypes:
-    """Test API content type handling."""
-
-    def test_json_content_type_required(self, api_client):
-        """Test that JSON content type is required for POST requests."""
+        # POST bodies must be JSON (415 = Unsupported Media Type)
         response = api_client.post(
             "/agents/general/chat",
             data="message=hello",
             content_type="application/x-www-form-urlencoded",
         )
+        assert response.status_code == 415, "JSON content type required"
 
-        # Should expect JSON (415 = Unsupported Media Type)
-        assert response.status_code == 415
-
-    def test_json_response_content_type(self, api_client):
-        """Test that responses have correct content type."""
         response = api_client.get("/health")
-
-        assert response.status_code == 200
-        assert "application/json" in response.content_type
+        assert response.status_code == 200, "JSON response content type"
+        assert "application/json" in response.content_type, "JSON response type"
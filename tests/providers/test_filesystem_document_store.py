@@ -0,0 +1,426 @@
+"""
+Unit tests for FileSystemDocumentStore.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from core.base_document_store import StoredDocument
+from providers.filesystem_document_store import FileSystemDocumentStore
+
+
+class TestFileSystemDocumentStore:
+    """Test FileSystemDocumentStore functionality."""
+
+    @pytest.fixture
+    def document_store(self, temp_dir):
+        """Create document store instance."""
+        return FileSystemDocumentStore({"path": temp_dir})
+
+    @pytest.fixture
+    def populated_store(self, document_store):
+        """Create document store with a few documents."""
+        document_store.store_document(
+            "Python is a programming language.", {"type": "programming"}
+        )
+        document_store.store_document(
+            "Machine learning builds models from data.", {"type": "ml"}
+        )
+        document_store.store_document(
+            "Flask is a Python web framework.", {"type": "programming"}
+        )
+        return document_store
+
+    @pytest.fixture
+    def retrieve_spy(self, populated_store, monkeypatch):
+        """Record document reads made through retrieve_document."""
+        spy = Mock(wraps=populated_store.retrieve_document)
+        monkeypatch.setattr(populated_store, "retrieve_document", spy)
+        return spy
+
+    def test_store_and_retrieve(self, document_store):
+        """Test storing and retrieving a document."""
+        doc_id = document_store.store_document(
+            "Hello world", {"author": "test"}, file_path="/tmp/hello.txt"
+        )
+
+        doc = document_store.retrieve_document(doc_id)
+
+        assert doc is not None
+        assert doc.content == "Hello world"
+        assert doc.metadata == {"author": "test"}
+        assert doc.file_path == "/tmp/hello.txt"
+
+    def test_retrieved_timestamps(self, document_store):
+        """Test that timestamps parse lazily and survive updates."""
+        doc_id = document_store.store_document("Timestamped", {})
+        doc = document_store.retrieve_document(doc_id)
+
+        assert isinstance(doc, StoredDocument)
+        assert isinstance(doc.created_at, datetime)
+        assert doc == document_store.retrieve_document(doc_id)
+
+        document_store.update_document(doc_id, metadata={"v": 2})
+        updated = document_store.retrieve_document(doc_id)
+
+        assert updated.created_at == doc.created_at
+        assert updated.updated_at >= doc.updated_at
+
+    def test_document_cache(self, temp_dir):
+        """Test that retrieved documents are cached and invalidated on writes."""
+        store = FileSystemDocumentStore({"path": temp_dir, "doc_cache_size": 2})
+        doc_ids = [store.store_document(f"Cached {i}", {"i": i}) for i in range(3)]
+
+        doc = store.retrieve_document(doc_ids[0])
+        doc.metadata["i"] = "mutated"
+        store._get_content_file_path(doc_ids[0]).unlink()
+
+        assert store.retrieve_document(doc_ids[0]).metadata == {"i": 0}
+
+        store.retrieve_document(doc_ids[1])
+        store.retrieve_document(doc_ids[2])
+        assert list(store._doc_cache) == doc_ids[1:]
+
+        store.update_document(doc_ids[1], metadata={"i": "updated"})
+        assert doc_ids[1] not in store._doc_cache
+        assert store.retrieve_document(doc_ids[1]).metadata == {"i": "updated"}
+
+        store.delete_document(doc_ids[2])
+        assert store.retrieve_document(doc_ids[2]) is None
+
+    def test_store_duplicate_content(self, document_store):
+        """Test storing duplicate content returns the existing document."""
+        doc_id1 = document_store.store_document("Same content", {"v": 1})
+        doc_id2 = document_store.store_document("Same content", {"v": 2})
+
+        assert doc_id1 == doc_id2
+        assert document_store.count_documents() == 1
+
+    def test_store_with_precomputed_hash(self, document_store, monkeypatch):
+        """Test that a caller-supplied content hash is not recomputed."""
+        content_hash = document_store._calculate_content_hash("Prehashed")
+        monkeypatch.setattr(
+            document_store,
+            "_calculate_content_hash",
+            lambda content: pytest.fail("content was rehashed"),
+        )
+
+        doc_id = document_store.store_document(
+            "Prehashed", {}, content_hash=content_hash
+        )
+        duplicate_id = document_store.store_document(
+            "Prehashed", {"v": 2}, content_hash=content_hash
+        )
+
+        assert duplicate_id == doc_id
+        assert document_store.retrieve_document(doc_id).content_hash == content_hash
+
+    def test_store_and_delete_documents_batch(self, document_store):
+        """Test batch storing and deleting documents."""
+        existing_id = document_store.store_document("Existing", {})
+
+        doc_ids = document_store.store_documents(
+            [
+                {"content": "First", "metadata": {"n": 1}},
+                {"content": "Existing", "metadata": {}},
+                {"content": "First", "metadata": {"n": 2}},
+                {"content": "Second", "metadata": {}, "file_path": "/tmp/second.txt"},
+            ]
+        )
+
+        assert doc_ids[0] == doc_ids[2]
+        assert doc_ids[1] == existing_id
+        assert document_store.count_documents() == 3
+        assert document_store.retrieve_document(doc_ids[3]).file_path == (
+            "/tmp/second.txt"
+        )
+
+        assert document_store.delete_documents([doc_ids[0], doc_ids[3]]) is True
+        assert document_store.count_documents() == 1
+
+    def test_store_large_document_direct_io(self, temp_dir):
+        """Test content above the direct I/O threshold round-trips."""
+        store = FileSystemDocumentStore({"path": temp_dir, "direct_io_threshold": 1})
+        content = "Large document é " * 500
+
+        doc_id = store.store_document(content, {})
+
+        assert store.retrieve_document(doc_id).content == content
+        assert store.update_document(doc_id, content=content + "!") is True
+        assert store.retrieve_document(doc_id).content == content + "!"
+
+        # Permissions do not depend on which write path a document took
+        small = FileSystemDocumentStore({"path": temp_dir + "/small"})
+        small_id = small.store_document("Small", {})
+        mode = os.stat(small._get_content_file_path(small_id)).st_mode & 0o777
+        assert os.stat(store._get_content_file_path(doc_id)).st_mode & 0o777 == mode
+
+    def test_atomic_writes_with_fsync(self, temp_dir):
+        """Test that fsync'd atomic writes leave no temporary files behind."""
+        store = FileSystemDocumentStore({"path": temp_dir, "fsync": True})
+        doc_id = store.store_document("Durable", {"v": 1})
+        store.update_document(doc_id, metadata={"v": 2})
+        store.close()
+
+        assert list(store.base_path.rglob("*.tmp")) == []
+        with open(store.index_file) as f:
+            assert doc_id in json.load(f)["documents"]
+        assert store.retrieve_document(doc_id).metadata == {"v": 2}
+
+    def test_get_document_by_hash(self, document_store):
+        """Test looking up a document by content hash."""
+        doc_id = document_store.store_document("Hashed content", {})
+        doc = document_store.retrieve_document(doc_id)
+
+        found = document_store.get_document_by_hash(doc.content_hash)
+
+        assert found is not None
+        assert found.doc_id == doc_id
+        assert document_store.get_document_by_hash("missing") is None
+
+    def test_get_document_by_hash_after_update(self, document_store):
+        """Test hash lookup follows content updates."""
+        doc_id = document_store.store_document("Original", {})
+        old_hash = document_store.retrieve_document(doc_id).content_hash
+
+        assert document_store.update_document(doc_id, content="Changed") is True
+
+        new_hash = document_store.retrieve_document(doc_id).content_hash
+        assert document_store.get_document_by_hash(old_hash) is None
+        assert document_store.get_document_by_hash(new_hash).doc_id == doc_id
+
+    def test_delete_document(self, document_store):
+        """Test deleting a document."""
+        doc_id = document_store.store_document("To delete", {})
+        content_hash = document_store.retrieve_document(doc_id).content_hash
+
+        assert document_store.delete_document(doc_id) is True
+        assert document_store.retrieve_document(doc_id) is None
+        assert document_store.get_document_by_hash(content_hash) is None
+        assert document_store.count_documents() == 0
+
+    def test_list_documents(self, populated_store):
+        """Test listing documents with filters and pagination."""
+        assert len(populated_store.list_documents()) == 3
+        assert len(populated_store.list_documents(filters={"type": "ml"})) == 1
+        assert len(populated_store.list_documents(limit=2)) == 2
+        assert len(populated_store.list_documents(offset=2)) == 1
+
+    def test_filters_require_key(self, populated_store):
+        """Test that a filter key absent from metadata does not match."""
+        populated_store.store_document("Untyped document", {})
+
+        assert populated_store.count_documents({"type": "ml"}) == 1
+        assert populated_store.count_documents({"missing": None}) == 0
+        assert populated_store.search_documents("document", {"type": "ml"}) == []
+
+    def test_indexed_fields(self, temp_dir):
+        """Test filtering through a secondary index on a metadata field."""
+        store = FileSystemDocumentStore({"path": temp_dir, "indexed_fields": ["type"]})
+        doc_id = store.store_document("First", {"type": "a", "tags": ["x"]})
+        store.store_document("Second", {"type": "b"})
+        store.store_document("Third", {"type": "a", "lang": "en"})
+
+        assert store.count_documents({"type": "a"}) == 2
+        assert store.count_documents({"type": "a", "lang": "en"}) == 1
+        assert store.count_documents({"tags": ["x"]}) == 1
+
+        store.update_document(doc_id, metadata={"type": "b"})
+        assert store.count_documents({"type": "a"}) == 1
+        assert len(store.list_documents(filters={"type": "b"})) == 2
+
+        store.delete_document(doc_id)
+        assert store.count_documents({"type": "b"}) == 1
+
+        store.close()
+        reopened = FileSystemDocumentStore(
+            {"path": temp_dir, "indexed_fields": ["type"]}
+        )
+        assert reopened.count_documents({"type": "a"}) == 1
+
+    def test_index_does_not_alias_caller_metadata(self, temp_dir):
+        """Test that editing metadata after a write leaves queries unchanged."""
+        store = FileSystemDocumentStore({"path": temp_dir, "indexed_fields": ["type"]})
+        metadata = {"type": "a", "tags": ["x"]}
+        doc_id = store.store_document("First", metadata)
+        metadata["type"] = "b"
+        metadata["tags"].append("y")
+
+        assert store.count_documents({"type": "a"}) == 1
+        assert store.count_documents({"type": "b"}) == 0
+        assert store.count_documents({"tags": ["x"]}) == 1
+
+        update = {"type": "c"}
+        store.update_document(doc_id, metadata=update)
+        update["type"] = "d"
+        assert store.count_documents({"type": "c"}) == 1
+        assert store.count_documents({"type": "d"}) == 0
+
+    def test_list_and_count_read_only_final_page(self, populated_store, retrieve_spy):
+        """Test that listing and counting work from the index."""
+        assert populated_store.count_documents({"type": "programming"}) == 2
+        assert retrieve_spy.call_count == 0
+
+        assert len(populated_store.list_documents(limit=1, offset=1)) == 1
+        assert retrieve_spy.call_count == 1
+
+    def test_list_documents_ordering(self, populated_store):
+        """Test ordering documents by timestamp."""
+        docs = populated_store.list_documents(order_by="-created_at")
+        created = [doc.created_at for doc in docs]
+
+        assert created == sorted(created, reverse=True)
+
+        # Bounded pages select the same entries as slicing the full ordering
+        for order_by in ("-created_at", "created_at"):
+            full = [d.doc_id for d in populated_store.list_documents(order_by=order_by)]
+            page = populated_store.list_documents(order_by=order_by, limit=2, offset=1)
+            assert [d.doc_id for d in page] == full[1:3]
+
+    def test_search_documents(self, populated_store):
+        """Test searching content and metadata."""
+        results = populated_store.search_documents("python")
+        assert len(results) == 2
+
+        results = populated_store.search_documents(
+            "python", filters={"type": "programming"}, limit=1
+        )
+        assert len(results) == 1
+
+        assert populated_store.search_documents("nonexistent") == []
+
+    def test_search_documents_inverted_index(self, populated_store, retrieve_spy):
+        """Test that search follows writes and only reads candidate documents."""
+        assert len(populated_store.search_documents("pyth")) == 2
+        assert len(populated_store.search_documents("web frame")) == 1
+
+        doc_id = populated_store.store_document("Rust is fast.", {"type": "systems"})
+        assert [d.doc_id for d in populated_store.search_documents("rust")] == [doc_id]
+        assert len(populated_store.search_documents("systems")) == 1
+
+        populated_store.update_document(doc_id, content="Go is simple.")
+        assert populated_store.search_documents("rust") == []
+        assert len(populated_store.search_documents("simple")) == 1
+
+        populated_store.delete_document(doc_id)
+        assert populated_store.search_documents("simple") == []
+
+        retrieve_spy.reset_mock()
+        assert len(populated_store.search_documents("machine")) == 1
+        assert retrieve_spy.call_count == 1
+
+    def test_search_documents_lowercase_cache(self, populated_store, retrieve_spy):
+        """Test that non-matching candidates are rejected without disk reads."""
+        populated_store.store_document("Ünïcode Straße", {"lang": "Deutsch"})
+
+        assert len(populated_store.search_documents("ÜNÏCODE STRASSE")) == 0
+        assert len(populated_store.search_documents("ünïcode straße")) == 1
+        assert len(populated_store.search_documents("deutsch")) == 1
+
+        retrieve_spy.reset_mock()
+        assert populated_store.search_documents("language python") == []
+        assert retrieve_spy.call_count == 0
+
+    def test_count_documents(self, populated_store):
+        """Test counting documents."""
+        assert populated_store.count_documents() == 3
+        assert populated_store.count_documents({"type": "programming"}) == 2
+
+    def test_concurrent_updates(self, document_store):
+        """Test parallel updates to distinct documents."""
+        doc_ids = [document_store.store_document(f"Doc {i}", {}) for i in range(4)]
+
+        def update(doc_id):
+            for n in range(10):
+                assert document_store.update_document(doc_id, metadata={"n": n})
+
+        threads = [threading.Thread(target=update, args=(d,)) for d in doc_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for doc_id in doc_ids:
+            assert document_store.retrieve_document(doc_id).metadata == {"n": 9}
+        assert document_store._doc_locks == {}
+
+    def test_index_persistence(self, populated_store, temp_dir):
+        """Test that the index survives reopening the store."""
+        populated_store.close()
+        reopened = FileSystemDocumentStore({"path": temp_dir})
+
+        assert reopened.count_documents() == 3
+        assert reopened.count_documents({"type": "ml"}) == 1
+        assert len(reopened.search_documents("flask")) == 1
+
+    def test_sharded_layout_migration(self, populated_store, temp_dir):
+        """Test that a legacy flat layout is migrated into shard directories."""
+        populated_store.close()
+        docs = {doc.doc_id: doc.content for doc in populated_store.list_documents()}
+
+        # Rewrite the store in the legacy flat layout
+        for doc_id in docs:
+            for path in (
+                populated_store._get_content_file_path(doc_id),
+                populated_store._get_metadata_file_path(doc_id),
+            ):
+                path.rename(path.parent.parent / path.name)
+        with open(populated_store.index_file, "w") as f:
+            json.dump(populated_store.index, f)
+
+        reopened = FileSystemDocumentStore({"path": temp_dir})
+
+        for doc_id, content in docs.items():
+            content_file = reopened._get_content_file_path(doc_id)
+            assert content_file.parent.name == reopened._shard(doc_id)
+            assert reopened.retrieve_document(doc_id).content == content
+        with open(reopened.index_file) as f:
+            assert json.load(f)["layout_version"] == 2
+
+    def test_index_log_replay(self, populated_store, temp_dir):
+        """Test that logged mutations are replayed without a snapshot."""
+        doc = populated_store.list_documents(filters={"type": "ml"})[0]
+        populated_store.delete_document(doc.doc_id)
+
+        reopened = FileSystemDocumentStore({"path": temp_dir})
+
+        assert not (populated_store.index_file).exists()
+        assert reopened.count_documents() == 2
+        assert reopened.count_documents({"type": "ml"}) == 0
+
+    def test_index_log_torn_tail(self, populated_store, temp_dir):
+        """Test that a torn log record does not swallow the next append."""
+        populated_store.close()
+        with open(populated_store.index_log_file, "ab") as f:
+            f.write(b'{"op": "put", "doc_')
+
+        reopened = FileSystemDocumentStore({"path": temp_dir, "fsync": True})
+        assert reopened.count_documents() == 3
+        doc_id = reopened.store_document("After the tear", {"type": "late"})
+
+        # Read the log before close() would compact it into the snapshot
+        again = FileSystemDocumentStore({"path": temp_dir})
+        assert again.count_documents() == 4
+        assert again.retrieve_document(doc_id).content == "After the tear"
+
+    def test_index_log_compaction(self, temp_dir):
+        """Test that the log is compacted into the snapshot once it grows."""
+        store = FileSystemDocumentStore(
+            {"path": temp_dir, "index_flush_interval_ms": 10, "index_compact_bytes": 1}
+        )
+        for i in range(5):
+            store.store_document(f"Document {i}", {"i": i})
+
+        timer = store._flush_timer
+        assert timer is not None
+        timer.join()
+
+        assert store._index_dirty is False
+        assert store.index_file.exists()
+        assert store.index_log_file.stat().st_size == 0
+        assert FileSystemDocumentStore({"path": temp_dir}).count_documents() == 5
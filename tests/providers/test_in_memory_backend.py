@@ -9,6 +9,22 @@ import pytest
 from core.base_memory_backend import ChatMessage
 from providers.in_memory_backend import InMemoryBackend
 
+_BACKEND_CONFIG = {"max_sessions": 100, "session_timeout_hours": 24}
+
+
+@pytest.fixture(scope="module")
+def sample_messages():
+    """Create sample chat messages, shared read-only across the module."""
+    now = datetime.now()
+    return tuple(
+        ChatMessage(role=role, content=content, timestamp=now)
+        for role, content in (
+            ("user", "Hello"),
+            ("assistant", "Hi there!"),
+            ("user", "How are you?"),
+        )
+    )
+
 
 class TestInMemoryBackend:
     """Test InMemoryBackend functionality."""
@@ -16,18 +32,7 @@ class TestInMemoryBackend:
     @pytest.fixture
     def memory_backend(self):
         """Create memory backend instance."""
-        config = {"max_sessions": 100, "session_timeout_hours": 24}
-        return InMemoryBackend(config)
-
-    @pytest.fixture
-    def sample_messages(self):
-        """Create sample chat messages."""
-        now = datetime.now()
-        return [
-            ChatMessage(role="user", content="Hello", timestamp=now),
-            ChatMessage(role="assistant", content="Hi there!", timestamp=now),
-            ChatMessage(role="user", content="How are you?", timestamp=now),
-        ]
+        return InMemoryBackend(_BACKEND_CONFIG)
 
     def test_backend_initialization(self, memory_backend):
         """Test backend initialization."""
@@ -156,12 +161,26 @@ class TestInMemoryBackend:
         assert len(messages) == 1
         assert messages[0].content == "First message"
 
+    def test_append_messages(self, sample_messages):
+        """Test appending a batch of messages to new and existing sessions."""
+        backend = InMemoryBackend({"verify_stats": True})
+
+        assert backend.append_messages("s1", sample_messages[:2], "test_agent")
+        assert backend.append_messages("s1", sample_messages[2:], "test_agent")
+
+        messages = backend.load_session("s1")
+        assert [m.content for m in messages] == [m.content for m in sample_messages]
+        assert backend.get_session_info("s1").message_count == 3
+        assert backend.get_stats()["total_messages"] == 3
+        assert backend.append_messages("", sample_messages, "test_agent") is False
+
     def test_get_recent_messages(self, memory_backend, sample_messages):
         """Test getting recent messages."""
         session_id = "test_session_6"
 
         # Create more messages
-        many_messages = sample_messages + [
+        many_messages = [
+            *sample_messages,
             ChatMessage(
                 role="assistant", content="Message 4", timestamp=datetime.now()
             ),
@@ -209,6 +228,11 @@ class TestInMemoryBackend:
         offset_sessions = memory_backend.list_sessions(offset=1, limit=2)
         assert len(offset_sessions) == 2
 
+        # Pages are slices of the most-recent-first ordering
+        ordered = [s.session_id for s in all_sessions]
+        assert [s.session_id for s in limited_sessions] == ordered[:2]
+        assert [s.session_id for s in offset_sessions] == ordered[1:3]
+
     def test_count_sessions(self, memory_backend, sample_messages):
         """Test counting sessions."""
         assert memory_backend.count_sessions() == 0
@@ -223,6 +247,28 @@ class TestInMemoryBackend:
         assert memory_backend.count_sessions(agent_type="agent1") == 2
         assert memory_backend.count_sessions(user_id="user1", agent_type="agent1") == 1
 
+    def test_filter_indexes_follow_removals(self, sample_messages):
+        """Test that filtered listings stay correct as sessions are removed."""
+        backend = InMemoryBackend({"max_sessions": 50})
+        for i in range(60):  # Evicts s0..s9
+            backend.save_session(
+                f"s{i}", sample_messages, f"agent{i % 3}", f"user{i % 4}"
+            )
+        backend.delete_session("s12")
+
+        expected = {
+            f"s{i}" for i in range(10, 60) if i % 3 == 0 and i % 4 == 0 and i != 12
+        }
+        sessions = backend.list_sessions(user_id="user0", agent_type="agent0")
+        assert {s.session_id for s in sessions} == expected
+        assert backend.count_sessions(user_id="user0", agent_type="agent0") == 3
+        assert backend.count_sessions(user_id="missing") == 0
+        assert backend.list_sessions(agent_type="missing") == []
+
+        for session_id in list(backend.session_info):
+            backend.delete_session(session_id)
+        assert backend._by_user == {} and backend._by_agent == {}
+
     def test_cleanup_expired_sessions(self, memory_backend):
         """Test cleaning up expired sessions."""
         now = datetime.now()
@@ -245,6 +291,18 @@ class TestInMemoryBackend:
         assert "old_session" not in memory_backend.sessions
         assert "new_session" in memory_backend.sessions
 
+    def test_cleanup_expired_sessions_any_order(self, memory_backend, sample_messages):
+        """Test that expiry finds stale sessions behind live ones."""
+        memory_backend.save_session("a", list(sample_messages), "test_agent")
+        memory_backend.save_session("b", list(sample_messages), "test_agent")
+        memory_backend.session_info["b"].last_active = datetime.now() - timedelta(
+            hours=30
+        )
+
+        assert memory_backend.cleanup_expired_sessions(max_age_hours=24) == 1
+        assert memory_backend.load_session("b") is None
+        assert memory_backend.load_session("a") is not None
+
     def test_max_sessions_limit(self, memory_backend, sample_messages):
         """Test max sessions limit enforcement."""
         # Set low limit for testing
@@ -264,6 +322,25 @@ class TestInMemoryBackend:
         assert "session_1" not in memory_backend.sessions
         assert "session_4" in memory_backend.sessions  # Most recent should remain
 
+    def test_max_sessions_evicts_least_recently_active(
+        self, memory_backend, sample_messages
+    ):
+        """Test that updating a session protects it from eviction."""
+        memory_backend.max_sessions = 3
+
+        for i in range(3):
+            memory_backend.save_session(f"session_{i}", sample_messages, "test_agent")
+        memory_backend.append_message("session_0", sample_messages[0], "test_agent")
+        memory_backend.save_session("session_3", sample_messages, "test_agent")
+
+        assert "session_0" in memory_backend.sessions
+        assert "session_1" not in memory_backend.sessions
+        assert list(memory_backend.session_info) == [
+            "session_2",
+            "session_0",
+            "session_3",
+        ]
+
     def test_get_stats(self, memory_backend, sample_messages):
         """Test getting backend statistics."""
         # Add some sessions
@@ -277,6 +354,91 @@ class TestInMemoryBackend:
         assert stats["max_sessions"] == 100
         assert stats["average_messages_per_session"] == 2.5
 
+    def test_get_stats_counter(self, sample_messages):
+        """Test that the running message total tracks every mutation."""
+        backend = InMemoryBackend({"max_sessions": 2, "verify_stats": True})
+
+        backend.save_session("s1", sample_messages[:2], "test_agent")
+        backend.save_session("s1", list(sample_messages), "test_agent")
+        backend.append_message("s1", sample_messages[0], "test_agent")
+        backend.save_session("s2", sample_messages[:1], "test_agent")
+        assert backend.get_stats()["total_messages"] == 5
+
+        backend.save_session("s3", sample_messages[:2], "test_agent")  # Evicts s1
+        assert backend.get_stats()["total_messages"] == 3
+
+        backend.delete_session("s2")
+        assert backend.get_stats()["total_messages"] == 2
+
+        backend.session_info["s3"].last_active = datetime.now() - timedelta(hours=25)
+        backend.cleanup_expired_sessions(max_age_hours=24)
+        assert backend.get_stats()["total_messages"] == 0
+
+    def test_max_messages_per_session(self, sample_messages):
+        """Test that capped sessions keep only their newest messages."""
+        backend = InMemoryBackend({"max_messages_per_session": 2, "verify_stats": True})
+
+        backend.save_session("s1", list(sample_messages), "test_agent")
+        assert [m.content for m in backend.load_session("s1")] == [
+            "Hi there!",
+            "How are you?",
+        ]
+
+        for i in range(10):
+            message = ChatMessage(role="user", content=str(i), timestamp=datetime.now())
+            backend.append_message("s1", message, "test_agent")
+
+        assert [m.content for m in backend.load_session("s1")] == ["8", "9"]
+        assert backend.get_session_info("s1").message_count == 2
+        assert backend.get_stats()["total_messages"] == 2
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_export_import_session(self, sample_messages, monkeypatch, use_orjson):
+        """Test that exported sessions restore into another backend."""
+        import providers.in_memory_backend as module
+
+        if not use_orjson:
+            monkeypatch.setattr(module, "orjson", None)
+        elif module.orjson is None:
+            pytest.skip("orjson not installed")
+
+        source = InMemoryBackend({})
+        source.save_session(
+            "s1", list(sample_messages), "test_agent", "user1", {"topic": "greeting"}
+        )
+        # Values JSON has no native type for export the same way on both paths
+        source.append_message(
+            "s1",
+            ChatMessage(
+                "user",
+                "Later",
+                datetime(2024, 1, 1, 12, 30),
+                {"seen": datetime(2024, 1, 2, 8, 0), 1: "one", "big": 2**70},
+            ),
+            "test_agent",
+        )
+        data = source.export_session("s1")
+        assert isinstance(data, bytes)
+        assert source.export_session("missing") is None
+
+        target = InMemoryBackend({"verify_stats": True})
+        assert target.import_session(data) is True
+        assert target.load_session("s1")[:3] == source.load_session("s1")[:3]
+        assert target.load_session("s1")[3].metadata == {
+            "seen": "2024-01-02T08:00:00",
+            "1": "one",
+            "big": 2**70,
+        }
+
+        restored = target.get_session_info("s1")
+        assert restored.created_at == source.get_session_info("s1").created_at
+        assert restored.user_id == "user1"
+        assert restored.metadata == {"topic": "greeting"}
+        assert target.count_sessions(user_id="user1") == 1
+        assert target.get_stats()["total_messages"] == 4
+
+        assert target.import_session(b"not json") is False
+
     def test_thread_safety_basic(self, memory_backend, sample_messages):
         """Test basic thread safety (using lock)."""
         import threading
@@ -307,6 +469,68 @@ class TestInMemoryBackend:
         assert all(isinstance(result, int) for result in results)
         assert all(result == 3 for result in results)  # All should see 3 messages
 
+    def test_concurrent_writes_and_listings(self, sample_messages):
+        """Test that many writers and listers leave consistent totals."""
+        import threading
+
+        backend = InMemoryBackend({"max_sessions": 1000, "verify_stats": True})
+        barrier = threading.Barrier(32, timeout=10)
+        errors = []
+
+        def worker(n):
+            barrier.wait()
+            try:
+                for i in range(20):
+                    session_id = f"s{n}_{i}"
+                    backend.save_session(
+                        session_id, list(sample_messages), f"agent{n % 2}", f"u{n}"
+                    )
+                    backend.append_message(session_id, sample_messages[0], "agent")
+                    backend.list_sessions(agent_type="agent0", limit=5)
+                    backend.count_sessions(user_id=f"u{n}")
+                    backend.get_stats()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert backend.count_sessions() == 640
+        assert backend.count_sessions(agent_type="agent0") == 320
+        assert backend.count_sessions(user_id="u7") == 20
+        assert backend.get_stats()["total_messages"] == 640 * 4
+
+    def test_lock_free_reads_during_appends(self, memory_backend):
+        """Test that unlocked reads stay consistent while messages are appended."""
+        import threading
+
+        session_id = "read_test"
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                recent = memory_backend.get_recent_messages(session_id, limit=5)
+                if len(recent) > 5 or not all(recent):
+                    errors.append(recent)
+
+        readers = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in readers:
+            thread.start()
+        for i in range(200):
+            message = ChatMessage(role="user", content=str(i), timestamp=datetime.now())
+            memory_backend.append_message(session_id, message, "test_agent")
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        assert errors == []
+        assert len(memory_backend.load_session(session_id)) == 200
+
     def test_error_handling(self, memory_backend):
         """Test error handling in various scenarios."""
         # Test with None values
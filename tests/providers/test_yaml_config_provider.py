@@ -0,0 +1,498 @@
+"""
+Unit tests for YAMLConfigProvider.
+"""
+
+import os
+import sys
+
+import pytest
+import yaml
+
+from providers.yaml_config_provider import (
+    YAMLConfigProvider,
+    _peek_top_level,
+    get_default_config,
+)
+
+
+class TestYAMLConfigProvider:
+    """Test YAMLConfigProvider functionality."""
+
+    @pytest.fixture
+    def config_files(self, temp_dir):
+        """Create a base and an override config file."""
+        base = os.path.join(temp_dir, "default.yaml")
+        override = os.path.join(temp_dir, "local.yaml")
+
+        with open(base, "w", encoding="utf-8") as f:
+            f.write(
+                "llm:\n"
+                "  type: openai\n"
+                "  temperature: 0.7\n"
+                "agents:\n"
+                "  general:\n"
+                "    tools: [web_search, calculator]\n"
+            )
+        with open(override, "w", encoding="utf-8") as f:
+            f.write("llm:\n  temperature: 0.2\napi:\n  port: 9000\n")
+
+        return [base, override]
+
+    @pytest.fixture
+    def config_provider(self, config_files):
+        """Create config provider from the test files."""
+        return YAMLConfigProvider(config_files)
+
+    def test_load_and_merge(self, config_provider):
+        """Test that later files override earlier ones key by key."""
+        assert config_provider.get_config("llm.type") == "openai"
+        assert config_provider.get_config("llm.temperature") == 0.2
+        assert config_provider.get_config("api.port") == 9000
+        assert config_provider.get_config("agents.general.tools") == [
+            "web_search",
+            "calculator",
+        ]
+        assert config_provider.get_config("llm.missing", "default") == "default"
+
+    def test_deep_merge(self, config_provider):
+        """Test merging nested sections without dropping sibling keys."""
+        target = {"a": {"b": {"c": 1, "d": 2}, "e": 3}, "f": 4}
+        source = {"a": {"b": {"c": 10}, "e": {"x": 1}}, "g": 5}
+
+        config_provider._deep_merge(target, source)
+
+        assert target == {"a": {"b": {"c": 10, "d": 2}, "e": {"x": 1}}, "f": 4, "g": 5}
+
+    def test_nway_merge(self, config_provider):
+        """Test that merging many sources matches merging them one by one."""
+        target = {"a": {"b": 1}, "s": {"t": 1}}
+        sources = [
+            {"a": {"c": 2}, "s": "scalar"},
+            {"a": {"b": 3, "d": {"e": 4}}, "s": {"u": 2}},
+            {"a": {"d": {"f": 5}}, "s": {"v": 3}},
+        ]
+
+        config_provider._nway_merge(target, sources)
+
+        assert target == {
+            "a": {"b": 3, "c": 2, "d": {"e": 4, "f": 5}},
+            "s": {"u": 2, "v": 3},
+        }
+
+    def test_cold_multi_file_load(
+        self, config_files, temp_dir, monkeypatch, capsys
+    ):
+        """Test that concurrently parsed files still merge in path order."""
+        import providers.yaml_config_provider as module
+
+        monkeypatch.setattr(module, "_PARSE_CACHE", module.OrderedDict())
+        bad = os.path.join(temp_dir, "bad.yaml")
+        listing = os.path.join(temp_dir, "list.yaml")
+        last = os.path.join(temp_dir, "last.yaml")
+        with open(bad, "w", encoding="utf-8") as f:
+            f.write("llm: [unclosed\n")
+        with open(listing, "w", encoding="utf-8") as f:
+            f.write("- just\n- a list\n")
+        with open(last, "w", encoding="utf-8") as f:
+            f.write("llm:\n  temperature: 0.5\n")
+
+        provider = YAMLConfigProvider(config_files + [bad, listing, last])
+
+        assert provider.get_config("llm.temperature") == 0.5
+        assert provider.get_config("llm.type") == "openai"
+        assert provider.get_config("api.port") == 9000
+        warnings = capsys.readouterr().out
+        assert bad in warnings
+        assert f"{listing}: top level is not a mapping" in warnings
+
+    def test_missing_files_are_skipped(self, temp_dir):
+        """Test that nonexistent config paths are ignored."""
+        provider = YAMLConfigProvider([os.path.join(temp_dir, "missing.yaml")])
+
+        assert provider.config_data == {}
+        assert provider.get_config_info()["loaded_files"] == []
+
+    def test_set_config_and_section(self, config_provider):
+        """Test setting values and reading whole sections."""
+        assert config_provider.set_config("llm.max_tokens", 100) is True
+
+        assert config_provider.get_section("llm") == {
+            "type": "openai",
+            "temperature": 0.2,
+            "max_tokens": 100,
+        }
+        assert config_provider.get_section("llm.type") == {}
+
+    def test_set_config_rejects_invalid_keys(self, config_provider):
+        """Test that non-string and empty keys are refused."""
+        before = config_provider.get_section("llm")
+
+        assert config_provider.set_config("", 1) is False
+        assert config_provider.set_config(None, 1) is False
+        assert config_provider.set_config(["llm", "type"], 1) is False
+        assert config_provider.get_section("llm") == before
+
+    def test_list_keys(self, config_provider):
+        """Test listing keys with and without a prefix."""
+        assert config_provider.list_keys("llm") == [
+            "llm",
+            "llm.temperature",
+            "llm.type",
+        ]
+        assert "agents.general.tools" in config_provider.list_keys()
+
+    def test_list_keys_prefix_matches_full_scan(self, config_provider):
+        """Test that prefix listing matches filtering the full key list."""
+        config_provider.set_config("agents.code.tools", ["calculator"])
+        config_provider.config_data[7] = {"x": 1}
+        config_provider.config_data["dotted.key"] = {"y": 2}
+        all_keys = config_provider.list_keys()
+
+        for prefix in [
+            "l",
+            "llm.te",
+            "agents.",
+            "agents.general",
+            "agents.general.tools.x",
+            "7.",
+            "dotted.k",
+            "missing.key",
+        ]:
+            expected = [k for k in all_keys if k.startswith(prefix)]
+            assert config_provider.list_keys(prefix) == expected, prefix
+
+    def test_save_and_reload(self, config_provider, temp_dir):
+        """Test saving the merged config and reloading it."""
+        output = os.path.join(temp_dir, "out", "saved.yaml")
+        config_provider.set_config("api.port", 8080)
+
+        assert config_provider.save_config(output) is True
+
+        saved = YAMLConfigProvider([output])
+        assert saved.get_config("api.port") == 8080
+        assert saved.get_config("llm.temperature") == 0.2
+
+    def test_save_config_sorts_keys(self, config_provider, temp_dir):
+        """Test that saved files keep sorted keys after later writes."""
+        output = os.path.join(temp_dir, "sorted.yaml")
+        config_provider.set_config("llm.api_key", "secret")
+        assert config_provider.save_config(output) is True
+
+        config_provider.set_config("aaa.zzz", 1)
+        config_provider.set_config("aaa.bbb", 2)
+        assert config_provider.save_config(output) is True
+
+        with open(output, "r", encoding="utf-8") as f:
+            top_level = [line.split(":")[0] for line in f if not line[0].isspace()]
+        assert top_level == sorted(top_level)
+        assert list(config_provider.get_section("aaa")) == ["bbb", "zzz"]
+        assert list(config_provider.get_section("llm"))[0] == "api_key"
+
+    def test_save_config_is_atomic(self, config_provider, temp_dir, monkeypatch):
+        """Test that a failed save leaves the previous file and no temp file."""
+        output = os.path.join(temp_dir, "atomic.yaml")
+        assert config_provider.save_config(output) is True
+        with open(output, "rb") as f:
+            before = f.read()
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail)
+        config_provider.set_config("api.port", 1234)
+        assert config_provider.save_config(output) is False
+
+        with open(output, "rb") as f:
+            assert f.read() == before
+        assert not [name for name in os.listdir(temp_dir) if name.endswith(".tmp")]
+
+    def test_save_config_skips_unchanged(self, config_provider, temp_dir):
+        """Test that writes are skipped while neither config nor file changed."""
+        output = os.path.join(temp_dir, "saved.yaml")
+        assert config_provider.save_config(output) is True
+
+        mtime = os.stat(output).st_mtime_ns
+
+        # Nothing changed: the file is left alone
+        assert config_provider.save_config(output) is True
+        assert os.stat(output).st_mtime_ns == mtime
+
+        # Changed and reverted: the file is left alone
+        config_provider.set_config("llm.temperature", 0.9)
+        config_provider.set_config("llm.temperature", 0.2)
+        assert config_provider.save_config(output) is True
+        assert os.stat(output).st_mtime_ns == mtime
+
+        # Edits made directly to config_data are still written
+        config_provider.config_data["llm"]["model"] = "b"
+        assert config_provider.save_config(output) is True
+        assert YAMLConfigProvider([output]).get_config("llm.model") == "b"
+
+        # Another path is written even though config is unchanged
+        other = os.path.join(temp_dir, "other.yaml")
+        assert config_provider.save_config(other) is True
+        assert os.path.exists(other)
+
+        # A file edited behind our back is rewritten
+        with open(output, "w", encoding="utf-8") as f:
+            f.write("edited: true\n")
+        assert config_provider.save_config(output) is True
+        assert YAMLConfigProvider([output]).get_config("llm.temperature") == 0.2
+
+        config_provider.set_config("api.port", 8081)
+        assert config_provider.save_config(output) is True
+        assert YAMLConfigProvider([output]).get_config("api.port") == 8081
+
+    def test_add_config_path(self, config_provider, temp_dir):
+        """Test adding another config file after construction."""
+        extra = os.path.join(temp_dir, "extra.yaml")
+        with open(extra, "w", encoding="utf-8") as f:
+            f.write("llm:\n  type: local\n")
+
+        assert config_provider.add_config_path(extra) is True
+        assert config_provider.get_config("llm.type") == "local"
+        assert extra in config_provider.config_paths
+
+    def test_reload_uses_parse_cache(self, config_provider, config_files, monkeypatch):
+        """Test that unchanged files are not re-parsed on reload."""
+        import providers.yaml_config_provider as module
+
+        parses = []
+        real_load = module.yaml.load
+        monkeypatch.setattr(
+            module.yaml,
+            "load",
+            lambda stream, Loader: parses.append(stream) or real_load(stream, Loader),
+        )
+        config_provider.set_config("llm.type", "mutated")
+
+        assert config_provider.reload_configs() is True
+        assert parses == []
+        assert config_provider.get_config("llm.type") == "openai"
+
+        with open(config_files[1], "a", encoding="utf-8") as f:
+            f.write("logging:\n  level: DEBUG\n")
+        os.utime(config_files[1], ns=(0, 10**18))
+
+        assert config_provider.reload_configs() is True
+        assert len(parses) == 1
+        assert config_provider.get_config("logging.level") == "DEBUG"
+
+    def test_msgpack_sidecar(self, config_files, temp_dir, monkeypatch):
+        """Test that a fresh msgpack snapshot is used instead of the YAML."""
+        pytest.importorskip("msgpack")
+        import providers.yaml_config_provider as module
+
+        cache_dir = os.path.join(temp_dir, "cache")
+        monkeypatch.setenv(module.SIDECAR_DIR_ENV, cache_dir)
+        monkeypatch.setattr(module, "_PARSE_CACHE", module.OrderedDict())
+        YAMLConfigProvider(config_files)
+        assert len(os.listdir(cache_dir)) == 2
+        assert not [name for name in os.listdir(temp_dir) if "msgpack" in name]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("YAML should not be parsed")
+
+        real_load = module.yaml.load
+        module._PARSE_CACHE.clear()
+        monkeypatch.setattr(module.yaml, "load", fail)
+        provider = YAMLConfigProvider(config_files)
+        assert provider.get_config("llm.temperature") == 0.2
+
+        # A changed file invalidates its snapshot
+        monkeypatch.setattr(module.yaml, "load", real_load)
+        with open(config_files[1], "a", encoding="utf-8") as f:
+            f.write("extra: 1\n")
+        module._PARSE_CACHE.clear()
+        assert YAMLConfigProvider(config_files).get_config("extra") == 1
+
+    def test_sidecar_skips_unpackable_values(self, temp_dir, monkeypatch):
+        """Test that values msgpack cannot encode still load from the YAML."""
+        pytest.importorskip("msgpack")
+        import providers.yaml_config_provider as module
+
+        cache_dir = os.path.join(temp_dir, "cache")
+        monkeypatch.setenv(module.SIDECAR_DIR_ENV, cache_dir)
+        monkeypatch.setattr(module, "_PARSE_CACHE", module.OrderedDict())
+        path = os.path.join(temp_dir, "big.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("a:\n  big: 123456789012345678901234\n")
+
+        provider = YAMLConfigProvider([path])
+        assert provider.get_config("a.big") == 123456789012345678901234
+        assert not os.path.exists(cache_dir)
+
+    @pytest.mark.parametrize("has_msgpack", [True, False])
+    def test_no_sidecar_by_default(
+        self, config_files, temp_dir, monkeypatch, has_msgpack
+    ):
+        """Test that no snapshot is written unless a cache dir is configured."""
+        import providers.yaml_config_provider as module
+
+        cache_dir = os.path.join(temp_dir, "cache")
+        if has_msgpack:
+            monkeypatch.delenv(module.SIDECAR_DIR_ENV, raising=False)
+        else:
+            monkeypatch.setenv(module.SIDECAR_DIR_ENV, cache_dir)
+            monkeypatch.setattr(module, "msgpack", None)
+        monkeypatch.setattr(module, "_PARSE_CACHE", module.OrderedDict())
+
+        provider = YAMLConfigProvider(config_files)
+        assert provider.get_config("api.port") == 9000
+        assert sorted(os.listdir(temp_dir)) == ["default.yaml", "local.yaml"]
+
+    def test_short_strings_are_interned(self, config_provider):
+        """Test that repeated short strings share one object after loading."""
+        default = get_default_config()
+        searches = [
+            tool
+            for agent in default["agents"].values()
+            for tool in agent["tools"]
+            if tool == "web_search"
+        ]
+        assert len(searches) > 1
+        assert all(tool is searches[0] for tool in searches)
+
+        tools = config_provider.get_config("agents.general.tools")
+        assert tools[0] is sys.intern("web_search")
+
+    def test_yaml_imported_on_first_use(self, monkeypatch):
+        """Test that PyYAML is only bound once a provider needs it."""
+        import providers.yaml_config_provider as module
+
+        for name in ("yaml", "_SafeLoader", "_SafeDumper"):
+            monkeypatch.setattr(module, name, None)
+
+        YAMLConfigProvider([])
+
+        assert module.yaml is yaml
+        assert module._SafeLoader is getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        assert module._SafeDumper is getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+    def test_get_config_cache_invalidation(self, config_provider, temp_dir):
+        """Test that cached lookups follow every kind of write."""
+        assert config_provider.get_config("llm.model") is None
+        assert config_provider.get_config("llm.type") == "openai"
+
+        config_provider.set_config("llm.model", "gpt-4")
+        assert config_provider.get_config("llm.model") == "gpt-4"
+
+        extra = os.path.join(temp_dir, "extra.yaml")
+        with open(extra, "w", encoding="utf-8") as f:
+            f.write("llm:\n  type: local\n")
+        config_provider.add_config_path(extra)
+        assert config_provider.get_config("llm.type") == "local"
+
+        config_provider.reload_configs()
+        assert config_provider.get_config("llm.model") is None
+
+    def test_returned_sections_are_copies(self, config_provider):
+        """Test that mutating returned sections leaves lookups unchanged."""
+        config_provider.set_config("llm.model", "a")
+        assert config_provider.get_config("llm.model") == "a"
+
+        config_provider.get_section("llm")["model"] = "b"
+        config_provider.get_config("llm")["model"] = "c"
+        config_provider.get_config("agents.general.tools").append("extra")
+
+        assert config_provider.get_config("llm.model") == "a"
+        assert config_provider.get_section("llm")["model"] == "a"
+        assert "extra" not in config_provider.get_config("agents.general.tools")
+
+    def test_from_defaults(self, config_files):
+        """Test building a provider from the embedded defaults."""
+        provider = YAMLConfigProvider.from_defaults([config_files[1]])
+
+        assert provider.get_config("memory.type") == "in_memory"
+        assert provider.get_config("api.port") == 9000
+        assert provider.reload_configs() is True
+        assert provider.get_config("agents.general.rag_settings.top_k") == 5
+
+        provider.set_config("memory.type", "redis")
+        assert get_default_config()["memory"]["type"] == "in_memory"
+
+    def test_unmodified_default_file_skips_parse(self, temp_dir, monkeypatch):
+        """Test that a pristine default.yaml reuses the embedded defaults."""
+        import providers.yaml_config_provider as module
+
+        assert module.create_default_config_file(temp_dir) is True
+        assert os.listdir(temp_dir) == ["default.yaml"]
+        default_path = os.path.join(temp_dir, "default.yaml")
+        get_default_config()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("YAML should not be parsed")
+
+        monkeypatch.setattr(module, "_PARSE_CACHE", module.OrderedDict())
+        monkeypatch.setattr(module.yaml, "load", fail)
+        provider = YAMLConfigProvider([default_path])
+        assert provider.config_data == get_default_config()
+
+        # Any edit falls back to a normal parse
+        monkeypatch.undo()
+        with open(default_path, "a", encoding="utf-8") as f:
+            f.write("extra: 1\n")
+        provider = YAMLConfigProvider([default_path])
+        assert provider.get_config("extra") == 1
+        assert provider.get_config("memory.type") == "in_memory"
+
+    def test_has_config(self, config_provider):
+        """Test key existence checks for leaves and sections."""
+        assert config_provider.has_config("llm.type") is True
+        assert config_provider.has_config("agents.general") is True
+        assert config_provider.has_config("llm.missing") is False
+        assert config_provider.has_config("llm.type.nested") is False
+
+        config_provider.set_config("llm.model", None)
+        assert config_provider.has_config("llm.model") is True
+
+    def test_get_config_info(self, config_files, temp_dir):
+        """Test that loaded_files lists only the paths that existed at load."""
+        missing = os.path.join(temp_dir, "missing.yaml")
+        provider = YAMLConfigProvider(config_files + [missing])
+
+        info = provider.get_config_info()
+        assert info["loaded_files"] == config_files
+        assert info["total_keys"] == len(provider.list_keys())
+
+        extra = os.path.join(temp_dir, "extra.yaml")
+        with open(extra, "w", encoding="utf-8") as f:
+            f.write("extra:\n  enabled: true\n")
+        assert provider.add_config_path(extra) is True
+        assert provider.get_config_info()["loaded_files"] == config_files + [extra]
+
+    def test_get_section_fast(self, config_provider, config_files, temp_dir):
+        """Test reading one section from the head of a large file."""
+        big = os.path.join(temp_dir, "big.yaml")
+        with open(big, "w", encoding="utf-8") as f:
+            f.write("agents:\n  general:\n    enabled: true\n")
+            f.write("padding:\n")
+            for i in range(2000):
+                f.write(f"  key_{i}: value_{i}\n")
+            f.write("tail:\n  port: 1\n")
+
+        assert config_provider.get_section_fast("agents", big) == {
+            "general": {"enabled": True}
+        }
+        # The last section in the head may be truncated, so it is not trusted
+        assert _peek_top_level(big, ["padding"]) is None
+        assert len(config_provider.get_section_fast("padding", big)) == 2000
+        assert config_provider.get_section_fast("tail", big) == {"port": 1}
+
+        assert config_provider.get_section_fast("llm", config_files[1]) == {
+            "temperature": 0.2
+        }
+        assert config_provider.get_section_fast("missing", config_files[1]) == {}
+        assert config_provider.get_section_fast("llm", big + ".nope") == {}
+
+    def test_has_config_uses_get_cache(self, config_provider, monkeypatch):
+        """Test that keys already looked up are answered without a walk."""
+        assert config_provider.get_config("agents.general") is not None
+        assert config_provider.get_config("llm.missing") is None
+
+        def fail(*args, **kwargs):
+            raise AssertionError("nested walk should not run")
+
+        monkeypatch.setattr(config_provider, "_get_nested_value", fail)
+        assert config_provider.has_config("agents.general") is True
+        assert config_provider.has_config("llm.missing") is False
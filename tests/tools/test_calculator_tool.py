@@ -2,77 +2,49 @@
 Unit tests for CalculatorTool.
 """
 
+import ast
+
 import pytest
 
 from tools.calculator_tool import CalculatorTool
 
 
+@pytest.fixture(scope="module")
+def calculator():
+    """Create calculator tool instance; it is stateless, so tests share it."""
+    return CalculatorTool({})
+
+
 class TestCalculatorTool:
     """Test CalculatorTool functionality."""
 
-    @pytest.fixture
-    def calculator(self):
-        """Create calculator tool instance."""
-        config = {}
-        return CalculatorTool(config)
-
     def test_tool_properties(self, calculator):
         """Test tool name and description."""
         assert calculator.name == "calculator"
         assert "mathematical calculations" in calculator.description.lower()
 
-    def test_simple_addition(self, calculator):
-        """Test simple addition."""
-        result = calculator.execute("2 + 3")
+    @pytest.mark.parametrize(
+        "expression,expected",
+        [
+            ("2 + 3", 5),
+            ("10 - 4", 6),
+            ("6 * 7", 42),
+            ("15 / 3", 5.0),
+            ("(2 + 3) * 4 - 1", 19),
+            ("2 ** 3", 8),
+            ("10 % 3", 1),
+            ("1e3 + 1e2", 1100),
+            ("-5 + 3", -2),
+            ("(2 + 3) * (4 - 1)", 15),
+        ],
+    )
+    def test_arithmetic(self, calculator, expression, expected):
+        """Test arithmetic operators, precedence and number formats."""
+        result = calculator.execute(expression)
 
         assert result.success is True
-        assert "5" in result.content
-        assert result.metadata["result"] == 5
-
-    def test_simple_subtraction(self, calculator):
-        """Test simple subtraction."""
-        result = calculator.execute("10 - 4")
-
-        assert result.success is True
-        assert "6" in result.content
-        assert result.metadata["result"] == 6
-
-    def test_multiplication(self, calculator):
-        """Test multiplication."""
-        result = calculator.execute("6 * 7")
-
-        assert result.success is True
-        assert "42" in result.content
-        assert result.metadata["result"] == 42
-
-    def test_division(self, calculator):
-        """Test division."""
-        result = calculator.execute("15 / 3")
-
-        assert result.success is True
-        assert "5" in result.content
-        assert result.metadata["result"] == 5.0
-
-    def test_complex_expression(self, calculator):
-        """Test complex mathematical expression."""
-        result = calculator.execute("(2 + 3) * 4 - 1")
-
-        assert result.success is True
-        assert result.metadata["result"] == 19
-
-    def test_exponentiation(self, calculator):
-        """Test exponentiation."""
-        result = calculator.execute("2 ** 3")
-
-        assert result.success is True
-        assert result.metadata["result"] == 8
-
-    def test_modulo(self, calculator):
-        """Test modulo operation."""
-        result = calculator.execute("10 % 3")
-
-        assert result.success is True
-        assert result.metadata["result"] == 1
+        assert result.metadata["result"] == expected
+        assert calculator._format_result(expected) in result.content
 
     def test_functions(self, calculator):
         """Test mathematical functions."""
@@ -91,6 +63,31 @@ class TestCalculatorTool:
         assert result.success is True
         assert result.metadata["result"] == 5
 
+    def test_repeated_expression_evaluated_once(self, calculator):
+        """Test that repeated expressions reuse the cached result."""
+        CalculatorTool.clear_cache()
+        for _ in range(3):
+            result = calculator.execute("(7 + 1) * 2")
+            assert result.metadata["result"] == 16
+
+        info = CalculatorTool._safe_eval.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+        # Non-numeric results are rejected rather than shared between calls
+        assert calculator._safe_eval("[1,2,3]") is None
+        assert calculator.execute("sum([1, 2, 3])").metadata["result"] == 6
+
+    def test_simple_fast_path_matches_ast(self, calculator):
+        """Test that integer shortcuts agree with full AST evaluation."""
+        for expression in ["2+3", "-5+3", "10--4", "2*-3", "15/3", "-7%3", "0-0"]:
+            expected = calculator._eval_node(ast.parse(expression, mode="eval").body)
+            result = calculator._safe_eval(expression)
+            assert result == expected and type(result) is type(expected)
+
+        # Literals Python rejects stay rejected
+        assert calculator._safe_eval("007+1") is None
+        assert calculator._safe_eval("1/0") is None
+
     def test_normalize_expression(self, calculator):
         """Test expression normalization."""
         # Test removing prefixes
@@ -102,6 +99,11 @@ class TestCalculatorTool:
         assert calculator._normalize_expression("2 x 3") == "2*3"
         assert calculator._normalize_expression("4 ÷ 2") == "4/2"
         assert calculator._normalize_expression("2 ^ 3") == "2**3"
+        assert calculator._normalize_expression("Evaluate 6 × 2 ÷ 4^2") == "6*2/4**2"
+        assert (
+            calculator._normalize_expression("sqrt(16) + square(3) * cube(2)")
+            == "pow(16, 0.5)+pow(3, 2)*pow(2, 3)"
+        )
 
     def test_input_validation(self, calculator):
         """Test input validation."""
@@ -175,57 +177,22 @@ class TestCalculatorTool:
         assert "required" in schema
         assert "input" in schema["required"]
 
-    def test_scientific_notation(self, calculator):
-        """Test scientific notation handling."""
-        result = calculator.execute("1e3 + 1e2")
-
-        assert result.success is True
-        assert result.metadata["result"] == 1100
-
-    def test_negative_numbers(self, calculator):
-        """Test negative number handling."""
-        result = calculator.execute("-5 + 3")
-
-        assert result.success is True
-        assert result.metadata["result"] == -2
-
-    def test_parentheses(self, calculator):
-        """Test parentheses handling."""
-        result = calculator.execute("(2 + 3) * (4 - 1)")
-
-        assert result.success is True
-        assert result.metadata["result"] == 15
-
 
 class TestCalculatorToolSafety:
     """Test calculator tool safety features."""
 
-    @pytest.fixture
-    def calculator(self):
-        """Create calculator tool instance."""
-        return CalculatorTool({})
-
-    def test_no_import_allowed(self, calculator):
-        """Test that import statements are not allowed."""
-        result = calculator.execute("import os")
-
-        assert result.success is False
-
-    def test_no_exec_allowed(self, calculator):
-        """Test that exec is not allowed."""
-        result = calculator.execute("exec('print(1)')")
+    @pytest.mark.parametrize(
+        "expression", ["import os", "exec('print(1)')", "eval('2+2')"]
+    )
+    def test_unsafe_input_rejected(self, calculator, expression):
+        """Test that imports, exec and eval are not allowed."""
+        result = calculator.execute(expression)
 
         assert result.success is False
 
-    def test_no_eval_allowed(self, calculator):
-        """Test that eval is not allowed in unsafe ways."""
-        result = calculator.execute("eval('2+2')")
-
-        assert result.success is False
-
-    def test_safe_mathematical_operations_only(self, calculator):
-        """Test that only safe mathematical operations are allowed."""
-        safe_operations = [
+    @pytest.mark.parametrize(
+        "operation",
+        [
             "2 + 2",
             "3.14 * 2",
             "abs(-5)",
@@ -233,11 +200,12 @@ class TestCalculatorToolSafety:
             "max(1, 2, 3)",
             "min(1, 2, 3)",
             "sum([1, 2, 3])",
-        ]
-
-        for operation in safe_operations:
-            result = calculator.execute(operation)
-            assert result.success is True, f"Safe operation failed: {operation}"
+        ],
+    )
+    def test_safe_mathematical_operations_only(self, calculator, operation):
+        """Test that only safe mathematical operations are allowed."""
+        result = calculator.execute(operation)
+        assert result.success is True, f"Safe operation failed: {operation}"
 
 
 # Example unittest.TestCase version (commented out)
@@ -159,6 +159,89 @@ class TestMockVectorStore:
         )
         assert programming_count == 1
 
+    def test_similarity_search_ranks_whole_store(self, mock_vector_store):
+        """Test that matches beyond the first k documents are still found."""
+        docs = [Document(f"filler {i}", {"n": i}, f"f{i}") for i in range(10)]
+        docs.append(Document("About Python", {"n": 10, "tags": ["a"]}, "py"))
+        mock_vector_store.add_documents(docs)
+
+        results = mock_vector_store.similarity_search("python", k=3)
+        assert [r.document.doc_id for r in results] == ["py", "f0", "f1"]
+        assert [r.score for r in results] == [0.8, 0.3, 0.3]
+
+        results = mock_vector_store.similarity_search("python", filters={"n": 4})
+        assert [r.document.doc_id for r in results] == ["f4"]
+
+        results = mock_vector_store.similarity_search("x", filters={"tags": ["a"]})
+        assert [r.document.doc_id for r in results] == ["py"]
+
+    def test_filter_on_none_matches_missing_keys(self, mock_vector_store):
+        """Test that a None filter also matches documents without the key."""
+        mock_vector_store.add_documents(
+            [
+                Document("python a", {"t": "x"}, "a"),
+                Document("python b", {}, "b"),
+                Document("python c", {"t": None}, "c"),
+            ]
+        )
+
+        listed = mock_vector_store.list_documents(filters={"t": None})
+        results = mock_vector_store.similarity_search("python", filters={"t": None})
+        assert [d.doc_id for d in listed] == ["b", "c"]
+        assert [r.document.doc_id for r in results] == ["b", "c"]
+
+    def test_similarity_search_after_delete(self, mock_vector_store):
+        """Test that deleted and replaced documents leave the search index."""
+        mock_vector_store.add_documents(
+            [
+                Document("python one", {"type": "a"}, "d1"),
+                Document("python two", {"type": "a"}, "d2"),
+            ]
+        )
+        mock_vector_store.delete_documents(["d1", "missing"])
+        mock_vector_store.add_documents([Document("rust", {"type": "b"}, "d2")])
+
+        results = mock_vector_store.similarity_search("python", filters={"type": "a"})
+        assert results == []
+        results = mock_vector_store.similarity_search("rust", filters={"type": "b"})
+        assert [r.document.content for r in results] == ["rust"]
+
+    def test_similarity_search_after_append(self, mock_vector_store):
+        """Test that documents added after a search are searchable."""
+        mock_vector_store.add_documents([Document("Python basics", {}, "d1")])
+        assert len(mock_vector_store.similarity_search("python")) == 1
+
+        mock_vector_store.add_documents(
+            [Document("Advanced PYTHON", {"type": "a"}, "d2")]
+        )
+        results = mock_vector_store.similarity_search("python")
+        assert [r.document.doc_id for r in results] == ["d1", "d2"]
+        results = mock_vector_store.similarity_search("python", filters={"type": "a"})
+        assert [r.document.doc_id for r in results] == ["d2"]
+
+    def test_deletes_compact_storage(self, mock_vector_store):
+        """Test that heavy deletion compacts slots without losing documents."""
+        docs = [Document(f"doc {i}", {"even": i % 2 == 0}, f"d{i}") for i in range(200)]
+        mock_vector_store.add_documents(docs)
+        mock_vector_store.delete_documents([f"d{i}" for i in range(150)])
+
+        assert len(mock_vector_store._ids) == 50
+        assert mock_vector_store.count_documents() == 50
+        assert mock_vector_store.get_document("d10") is None
+        assert mock_vector_store.get_document("d199").content == "doc 199"
+
+        results = mock_vector_store.similarity_search(
+            "doc 19", k=20, filters={"even": True}
+        )
+        assert [r.document.doc_id for r in results[:5]] == [
+            "d190",
+            "d192",
+            "d194",
+            "d196",
+            "d198",
+        ]
+        assert all(r.score == 0.8 for r in results[:5])
+
     def test_empty_vector_store(self, mock_vector_store):
         """Test operations on empty vector store."""
         assert mock_vector_store.count_documents() == 0
@@ -2,6 +2,8 @@
 Unit tests for ComponentFactory.
 """
 
+from types import SimpleNamespace
+
 import pytest
 
 from core.base_config_provider import ConfigProvider
@@ -98,6 +100,20 @@ class TestComponentFactory:
         with pytest.raises(ValueError, match="Unknown vector store type"):
             ComponentFactory.create_vector_store(config)
 
+    def test_create_vector_store_lazy_load(self, monkeypatch):
+        """Test that unregistered built-in vector stores are loaded on demand."""
+        monkeypatch.setattr(
+            ComponentFactory,
+            "_lazy_vector_stores",
+            {"lazy_vector": "tests.conftest:MockVectorStore"},
+        )
+        monkeypatch.setattr(ComponentFactory, "_vector_store_registry", {})
+
+        store = ComponentFactory.create_vector_store({"type": "lazy_vector"})
+
+        assert type(store).__name__ == "MockVectorStore"
+        assert "lazy_vector" in ComponentFactory._vector_store_registry
+
     def test_create_memory_backend_with_default(self):
         """Test creating memory backend with default type."""
 
@@ -154,6 +170,25 @@ class TestComponentFactory:
         # Should be a CompositeConfigProvider
         assert hasattr(config_provider, "providers")
 
+    def test_default_provider_list_keys_follows_writes(self):
+        """Test that cached key listings reflect later set_config calls."""
+        provider = ComponentFactory._create_default_provider()
+
+        assert provider.list_keys("llm.") == ["llm.type", "llm.model"]
+        assert provider.list_keys("llm.") == ["llm.type", "llm.model"]
+
+        provider.set_config("llm.temperature", 0.5)
+        assert provider.list_keys("llm.") == [
+            "llm.type",
+            "llm.model",
+            "llm.temperature",
+        ]
+        assert "llm.temperature" in provider.list_keys()
+
+        # Callers get their own list, not the cached entries
+        provider.list_keys("llm.").clear()
+        assert len(provider.list_keys("llm.")) == 3
+
     def test_list_available_implementations(self):
         """Test listing available implementations."""
         implementations = ComponentFactory.list_available_implementations()
@@ -170,6 +205,18 @@ class TestComponentFactory:
         assert "test_vector" in implementations["vector_stores"]
         assert "test_memory" in implementations["memory_backends"]
 
+    def test_list_available_implementations_includes_lazy(self, monkeypatch):
+        """Test that vector stores loaded on first use are listed."""
+        import core.component_factory as module
+
+        entry_point = SimpleNamespace(name="plugin_vector")
+        monkeypatch.setattr(module, "_vector_store_entry_points", lambda: [entry_point])
+        monkeypatch.setattr(ComponentFactory, "_vector_store_registry", {})
+
+        implementations = ComponentFactory.list_available_implementations()
+
+        assert implementations["vector_stores"] == ["chroma", "plugin_vector"]
+
     def test_create_tool_registry(self):
         """Test creating tool registry with configurations."""
         from core.base_tool import BaseTool, ToolRegistry, ToolResult
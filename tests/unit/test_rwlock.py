@@ -0,0 +1,79 @@
+"""
+Unit tests for RWLock.
+"""
+
+import threading
+
+import pytest
+
+from core.rwlock import RWLock
+
+
+class TestRWLock:
+    """Test RWLock functionality."""
+
+    def test_concurrent_readers(self):
+        """Test that several threads can hold the read lock at once."""
+        lock = RWLock()
+        barrier = threading.Barrier(3, timeout=5)
+        results = []
+
+        def reader():
+            with lock.read_locked():
+                # Every reader must be inside the lock for the barrier to pass
+                barrier.wait()
+                results.append(True)
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [True, True, True]
+
+    def test_writer_excludes_readers(self):
+        """Test that readers wait while a writer holds the lock."""
+        lock = RWLock()
+        events = []
+
+        def reader_func():
+            with lock.read_locked():
+                events.append("read")
+
+        lock.acquire_write()
+        reader = threading.Thread(target=reader_func)
+        reader.start()
+        reader.join(timeout=0.05)
+
+        assert reader.is_alive()
+        events.append("write released")
+        lock.release_write()
+        reader.join(timeout=5)
+
+        assert events == ["write released", "read"]
+
+    def test_reentrancy(self):
+        """Test nested acquisition by the owning thread."""
+        lock = RWLock()
+
+        with lock.write_locked():
+            with lock.write_locked():
+                with lock.read_locked():
+                    pass
+
+        with lock.read_locked():
+            with lock.read_locked():
+                pass
+
+        # Lock must be fully released again
+        with lock.write_locked():
+            pass
+
+    def test_upgrade_not_allowed(self):
+        """Test that upgrading a read lock raises instead of deadlocking."""
+        lock = RWLock()
+
+        with lock.read_locked():
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
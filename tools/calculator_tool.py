@@ -1,10 +1,77 @@
 import ast
+import numbers
 import operator
 import re
+from functools import lru_cache
 from typing import Any, Dict, List
 
 from core.base_tool import BaseTool, ToolResult
 
+# Leading words stripped from requests like "calculate 2 + 2"
+_PREFIX_RE = re.compile(r"^(calculate|compute|eval|evaluate)\s+", re.IGNORECASE)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 'x' used as multiplication, standalone or between numbers/parentheses
+_STANDALONE_X_RE = re.compile(r"\bx\b")
+_INFIX_X_RE = re.compile(r"(\d|\))x(\d|\()")
+
+# Basic math functions rewritten to pow() calls
+_MATH_FUNCTIONS = [
+    (re.compile(r"sqrt\(([^)]+)\)"), r"pow(\1, 0.5)"),
+    (re.compile(r"square\(([^)]+)\)"), r"pow(\1, 2)"),
+    (re.compile(r"cube\(([^)]+)\)"), r"pow(\1, 3)"),
+]
+
+# Common mathematical notation mapped to Python operators in a single pass
+_SYMBOLS = str.maketrans(
+    {
+        "×": "*",  # multiplication symbol
+        "÷": "/",  # division symbol
+        "^": "**",  # exponentiation
+    }
+)
+
+# "<int><op><int>" after normalization, evaluated without building an AST.
+# Leading zeros are excluded because Python rejects them as literals
+_INT = r"(-?(?:0|[1-9][0-9]*))"
+_SIMPLE_RE = re.compile(_INT + r"([-+*/%])" + _INT)
+_SIMPLE_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "%": operator.mod,
+}
+
+# Characters accepted by validate_input
+_VALID_CHARS = frozenset(
+    "0123456789+-*/().%^×÷ abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+)
+
+# Static tool metadata, built once and returned by reference
+_USAGE_EXAMPLES = [
+    "2 + 3 * 4",
+    "sqrt(16) + 2",
+    "(10 + 5) / 3",
+    "2 ** 3",
+    "abs(-15)",
+    "round(3.14159, 2)",
+    "max(10, 20, 5)",
+    "calculate 15% of 200",
+]
+_PARAMETER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "input": {
+            "type": "string",
+            "description": "Mathematical expression to calculate",
+            "examples": ["2 + 3 * 4", "sqrt(16) + 2", "(10 + 5) / 3"],
+        }
+    },
+    "required": ["input"],
+}
+
 
 class CalculatorTool(BaseTool):
     """Simple calculator tool for mathematical expressions."""
@@ -92,84 +159,78 @@ class CalculatorTool(BaseTool):
     def _normalize_expression(self, input_text: str) -> str:
         """Normalize and clean the mathematical expression."""
         # Remove common prefixes
-        expression = re.sub(
-            r"^(calculate|compute|eval|evaluate)\s+",
-            "",
-            input_text.strip(),
-            flags=re.IGNORECASE,
-        )
+        expression = _PREFIX_RE.sub("", input_text.strip())
 
         # Remove extra whitespace
-        expression = re.sub(r"\s+", "", expression)
+        expression = _WHITESPACE_RE.sub("", expression)
 
         # Replace common mathematical notation
-        replacements = {
-            "×": "*",  # multiplication symbol
-            "÷": "/",  # division symbol
-            "^": "**",  # exponentiation
-        }
-
-        for old, new in replacements.items():
-            expression = expression.replace(old, new)
+        expression = expression.translate(_SYMBOLS)
 
         # Handle 'x' as multiplication with two patterns:
         # 1. Standalone x (with word boundaries): "2 x 3", "x+5", "(x)"
-        expression = re.sub(r"\bx\b", "*", expression)
+        expression = _STANDALONE_X_RE.sub("*", expression)
         # 2. x between numbers/parentheses: "5x3", "(2)x(3)", "5x(3+2)"
-        expression = re.sub(r"(\d|\))x(\d|\()", r"\1*\2", expression)
-
-        # Add basic math functions
-        math_functions = {
-            "sqrt": "pow({}, 0.5)",
-            "square": "pow({}, 2)",
-            "cube": "pow({}, 3)",
-        }
+        expression = _INFIX_X_RE.sub(r"\1*\2", expression)
 
         # Handle sqrt, square, cube functions
-        for func, replacement in math_functions.items():
-            pattern = f"{func}\\(([^)]+)\\)"
-            matches = re.findall(pattern, expression)
-            for match in matches:
-                expression = expression.replace(
-                    f"{func}({match})", replacement.format(match)
-                )
+        for pattern, replacement in _MATH_FUNCTIONS:
+            expression = pattern.sub(replacement, expression)
 
         return expression
 
-    def _safe_eval(self, expression: str):
-        """Safely evaluate a mathematical expression using AST."""
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _safe_eval(expression: str):
+        """
+        Safely evaluate a mathematical expression using AST.
+
+        Evaluation only touches literals, whitelisted operators and pure
+        functions, so results are cached per normalized expression. Only
+        numeric results are returned, which keeps cached values immutable.
+        """
         try:
-            # Parse the expression into an AST
-            node = ast.parse(expression, mode="eval")
-            return self._eval_node(node.body)
+            simple = _SIMPLE_RE.fullmatch(expression)
+            if simple:
+                left, op, right = simple.groups()
+                return _SIMPLE_OPS[op](int(left), int(right))
+            result = CalculatorTool._eval_node(ast.parse(expression, mode="eval").body)
+            return result if isinstance(result, numbers.Number) else None
         except Exception:
             return None
 
-    def _eval_node(self, node):
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Clear cached evaluation results."""
+        cls._safe_eval.cache_clear()
+
+    @staticmethod
+    def _eval_node(node):
         """Recursively evaluate AST nodes."""
+        eval_node = CalculatorTool._eval_node
         if isinstance(node, ast.Constant):  # Python 3.8+
             return node.value
         elif isinstance(node, ast.Num):  # Python < 3.8
             return node.n
         elif isinstance(node, ast.BinOp):
-            left = self._eval_node(node.left)
-            right = self._eval_node(node.right)
-            operator_func = self.OPERATORS.get(type(node.op))
+            left = eval_node(node.left)
+            right = eval_node(node.right)
+            operator_func = CalculatorTool.OPERATORS.get(type(node.op))
             if operator_func:
                 return operator_func(left, right)
         elif isinstance(node, ast.UnaryOp):
-            operand = self._eval_node(node.operand)
-            operator_func = self.OPERATORS.get(type(node.op))
+            operand = eval_node(node.operand)
+            operator_func = CalculatorTool.OPERATORS.get(type(node.op))
             if operator_func:
                 return operator_func(operand)
         elif isinstance(node, ast.Call):
             func_name = node.func.id if isinstance(node.func, ast.Name) else None
-            if func_name in self.FUNCTIONS:
-                args = [self._eval_node(arg) for arg in node.args]
-                return self.FUNCTIONS[func_name](*args)
+            if func_name in CalculatorTool.FUNCTIONS:
+                args = [eval_node(arg) for arg in node.args]
+                return CalculatorTool.FUNCTIONS[func_name](*args)
         elif isinstance(node, ast.List):
             # Support list literals like [1, 2, 3]
-            return [self._eval_node(item) for item in node.elts]
+            return [eval_node(item) for item in node.elts]
         elif isinstance(node, ast.Name):
             # Handle constants like 'pi' or 'e'
             constants = {"pi": 3.141592653589793, "e": 2.718281828459045}
@@ -195,37 +256,15 @@ class CalculatorTool(BaseTool):
             return False
 
         # Check for basic mathematical characters
-        valid_chars = set(
-            "0123456789+-*/().%^×÷ abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        )
-        return all(c in valid_chars for c in input_text)
+        return _VALID_CHARS.issuperset(input_text)
 
     def get_usage_examples(self) -> List[str]:
-        """Get examples of how to use this tool."""
-        return [
-            "2 + 3 * 4",
-            "sqrt(16) + 2",
-            "(10 + 5) / 3",
-            "2 ** 3",
-            "abs(-15)",
-            "round(3.14159, 2)",
-            "max(10, 20, 5)",
-            "calculate 15% of 200",
-        ]
+        """Get examples of how to use this tool (shared; do not mutate)."""
+        return _USAGE_EXAMPLES
 
     def get_parameter_schema(self) -> Dict[str, Any]:
-        """Get schema for tool parameters."""
-        return {
-            "type": "object",
-            "properties": {
-                "input": {
-                    "type": "string",
-                    "description": "Mathematical expression to calculate",
-                    "examples": ["2 + 3 * 4", "sqrt(16) + 2", "(10 + 5) / 3"],
-                }
-            },
-            "required": ["input"],
-        }
+        """Get schema for tool parameters (shared; do not mutate)."""
+        return _PARAMETER_SCHEMA
 
 
 # Register with factory